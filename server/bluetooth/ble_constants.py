@@ -6,7 +6,11 @@ with physical Rocket League cars, including service UUIDs, characteristic defini
 and utility functions for data handling and validation.
 """
 
+import asyncio
 import logging
+import os
+from dataclasses import dataclass
+from typing import Tuple
 
 # BLE Service and Characteristic UUIDs for PDG cars
 # These UUIDs must match the firmware implementation on the car's ESP32 controller
@@ -31,10 +35,65 @@ CHAR_DECAY_MODE = "7f1f9b2a-6a43-4f62-8c2a-b9d3c0e4a1fa" # Motor braking behavio
 # Device identification constants
 CAR_DEVICE_PREFIX = "RL-CAR-"  # BLE advertisement name prefix for car discovery
 
+# Seconds a link that recently completed a GATT operation is trusted without a health-check read
+LINK_REUSE_TTL = 30.0
+
+# Minimum spacing between commands written to the same car, in seconds. One write per
+# BLE connection interval (7.5 ms at the shortest) is all the controller can drain
+COMMAND_MIN_INTERVAL = 0.0075
+
+# Upper bound on BLE operations in flight at once; beyond that the controller
+# starts rejecting requests (HCI "Command Disallowed")
+MAX_CONCURRENT_BLE_OPS = 3
+
+# Seconds between passes of the control-phase keepalive that reconnects dropped cars
+KEEPALIVE_INTERVAL = 15.0
+
+# Failed keepalive reconnects after which a car is left alone until the next control
+# phase; between failures the wait doubles from KEEPALIVE_INTERVAL
+KEEPALIVE_MAX_FAILURES = 4
+
+# LE connection interval bounds requested for new links, in 1.25 ms units (6 = 7.5 ms,
+# the shortest the spec allows). BlueZ only exposes these through debugfs
+CONN_MIN_INTERVAL = 6
+CONN_MAX_INTERVAL = 9
+BT_DEBUGFS_PATH = "/sys/kernel/debug/bluetooth"
+
 # Module logger for debugging BLE operations
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class ScanConfig:
+    """
+    Tuning knobs for BLE scanning, overridable through environment variables.
+    
+    Attributes:
+        discovery_timeout (float): Duration of the scan phase discovery in seconds
+            (RL_BLE_DISCOVERY_TIMEOUT)
+        refresh_timeout (float): Duration of the scan used to refresh a device
+            reference before connecting, in seconds (RL_BLE_REFRESH_TIMEOUT)
+        advert_max_age (float): Advertisements newer than this many seconds make the
+            refresh scan unnecessary (RL_BLE_ADVERT_MAX_AGE)
+    """
+    discovery_timeout: float = 10.0
+    refresh_timeout: float = 5.0
+    advert_max_age: float = 10.0
+
+    @classmethod
+    def from_env(cls) -> "ScanConfig":
+        """Build the configuration from environment variables, keeping defaults for unset ones."""
+        return cls(
+            discovery_timeout=float(os.environ.get("RL_BLE_DISCOVERY_TIMEOUT", cls.discovery_timeout)),
+            refresh_timeout=float(os.environ.get("RL_BLE_REFRESH_TIMEOUT", cls.refresh_timeout)),
+            advert_max_age=float(os.environ.get("RL_BLE_ADVERT_MAX_AGE", cls.advert_max_age)),
+        )
+
+
+# Scan configuration shared by the BLE service
+SCAN_CONFIG = ScanConfig.from_env()
+
+
 def dump(label, data):
     """
     Debug utility to log binary data in both hexadecimal and text formats.
@@ -70,6 +129,37 @@ def clamp(v: int, lo: int, hi: int) -> int:
     return max(lo, min(hi, v))
 
 
+async def run_command(*args: str, timeout: float = 5.0) -> Tuple[int, str]:
+    """
+    Run a system command without blocking the event loop.
+    
+    Used for the BlueZ command-line tools (hcitool, bluetoothctl) so that
+    connection cleanup does not stall WebSocket traffic while they execute.
+    
+    Args:
+        *args (str): Command and its arguments
+        timeout (float): Maximum time to wait for the command in seconds
+        
+    Returns:
+        tuple: (return_code, stdout) of the finished command
+        
+    Raises:
+        asyncio.TimeoutError: If the command does not finish within timeout
+    """
+    process = await asyncio.create_subprocess_exec(
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL
+    )
+    try:
+        stdout, _ = await asyncio.wait_for(process.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise
+    return process.returncode, stdout.decode("utf-8", errors="ignore")
+
+
 def check_bluetooth_dependencies() -> bool:
     """
     Verify that required Bluetooth libraries are available for import.
@@ -17,18 +17,24 @@ Key Features:
 import asyncio
 import logging
 import struct
-from typing import Optional, Callable
+from typing import Awaitable, Optional, Callable
 from bleak import BleakClient
 from bleak.backends.device import BLEDevice
 
 from .ble_constants import (
     CHAR_SSID, CHAR_PASS, CHAR_APPLY, CHAR_STATUS, CHAR_DEVID, CHAR_BATTERY,
     CHAR_DIR_X, CHAR_DIR_Y, CHAR_DIR_SPEED, CHAR_DECAY_MODE,
-    clamp, dump
+    clamp, dump, run_command
 )
 
 logger = logging.getLogger(__name__)
 
+# ATT MTU every link starts with, before the MTU exchange
+_DEFAULT_ATT_MTU = 23
+
+# Whether the missing private bleak MTU hook has been reported already
+_MTU_HOOK_MISSING_LOGGED = False
+
 
 class PDGCarDevice:
     """
@@ -48,56 +54,198 @@ class PDGCarDevice:
         client (BleakClient): Active BLE client connection
     """
     
+    __slots__ = (
+        "device", "_device_id", "name", "address", "_rssi", "last_advertisement",
+        "last_activity", "_is_connected", "_disconnected_event", "client", "status_callback", "adapter",
+        "_dict_cache", "_drive_state", "_connect_future"
+    )
+    
     def __init__(self, device: BLEDevice, device_id: str = None, adapter: str = None):
+        self._dict_cache: Optional[dict] = None  # Last to_dict() result, dropped when a field in it changes
+        self._drive_state: Optional[tuple] = None  # Last (x, y, speed, decay_mode) written on this link
         self.device = device
-        self.device_id = device_id
+        self._device_id = device_id
         self.name = device.name or "Unknown"
         self.address = device.address
-        self.rssi = None  # Signal strength from advertisement data
-        self.is_connected = False
+        self._rssi = None  # Signal strength from advertisement data
+        self.last_advertisement: Optional[float] = None  # Event loop time of the last advertisement seen
+        self.last_activity: Optional[float] = None  # Event loop time of the last successful GATT operation
+        self._disconnected_event = asyncio.Event()  # Set while the link is down, for tasks racing a disconnect
+        self._disconnected_event.set()
+        self._is_connected = False
+        self._connect_future: Optional[asyncio.Future] = None  # Result of the connection attempt in progress
         self.client: Optional[BleakClient] = None
         self.status_callback: Optional[Callable] = None
         self.adapter = adapter or "hci1"  # Default Bluetooth adapter for Raspberry Pi
 
+    @property
+    def device_id(self) -> Optional[str]:
+        """Unique identifier read from the car's firmware."""
+        return self._device_id
+
+    @device_id.setter
+    def device_id(self, value: Optional[str]):
+        self._device_id = value
+        self._dict_cache = None
+
+    @property
+    def rssi(self) -> Optional[int]:
+        """Signal strength from the latest advertisement."""
+        return self._rssi
+
+    @rssi.setter
+    def rssi(self, value: Optional[int]):
+        if value != self._rssi:
+            self._rssi = value
+            self._dict_cache = None
+
+    @property
+    def is_connecting(self) -> bool:
+        """Whether a connection attempt is in progress; connect() joins it."""
+        return self._connect_future is not None
+
+    @property
+    def is_connected(self) -> bool:
+        """Current connection status."""
+        return self._is_connected
+
+    @is_connected.setter
+    def is_connected(self, value: bool):
+        self._is_connected = value
+        self._dict_cache = None
+        self._drive_state = None  # The car may have restarted; write every drive value again
+        if value:
+            self._disconnected_event.clear()
+        else:
+            self._disconnected_event.set()
+
+    async def run_while_connected(self, operation: Awaitable):
+        """
+        Await a BLE operation, failing fast if the link drops before it completes.
+        
+        Without this, an operation on a link that went away only fails when
+        the GATT request times out.
+        
+        Args:
+            operation (Awaitable): Operation to run on the connected device
+            
+        Returns:
+            The result of the operation
+            
+        Raises:
+            ConnectionError: If the device disconnects before the operation completes
+        """
+        operation_task = asyncio.ensure_future(operation)
+        disconnect_task = asyncio.ensure_future(self._disconnected_event.wait())
+        try:
+            await asyncio.wait({operation_task, disconnect_task}, return_when=asyncio.FIRST_COMPLETED)
+        except BaseException:
+            # The caller was cancelled (superseded command, timeout): stop the write too,
+            # otherwise it keeps running on its own and races newer commands to the car
+            if not operation_task.done():
+                operation_task.cancel()
+            raise
+        finally:
+            disconnect_task.cancel()
+        if not operation_task.done():
+            operation_task.cancel()
+            raise ConnectionError(f"{self.name} disconnected during the operation")
+        return operation_task.result()
+
+    def _on_disconnected(self, client: BleakClient):
+        """Bleak callback invoked when the link drops, including unexpected disconnects."""
+        if client is self.client and self.is_connected:
+            logger.warning(f"Lost connection to {self.name} ({self.address})")
+            self.is_connected = False
+
+    async def _acquire_mtu(self):
+        """
+        Make sure bleak reports the ATT MTU negotiated by BlueZ for this link.
+        
+        The public BleakClient.mtu_size is used whenever it already reflects the
+        negotiated value. Some bleak versions' BlueZ backend report the 23-byte
+        default until the MTU is acquired explicitly; only then is the backend's
+        private hook tried, and its absence is logged once instead of failing.
+        Connection interval is not exposed by BlueZ over D-Bus and is left as is.
+        """
+        global _MTU_HOOK_MISSING_LOGGED
+        if self.client.mtu_size > _DEFAULT_ATT_MTU:
+            logger.info(f"ATT MTU for {self.name}: {self.client.mtu_size}")
+            return
+        
+        # Private bleak API, not guaranteed to exist across versions
+        acquire = getattr(getattr(self.client, "_backend", None), "_acquire_mtu", None)
+        if acquire is None:
+            if not _MTU_HOOK_MISSING_LOGGED:
+                _MTU_HOOK_MISSING_LOGGED = True
+                logger.info(f"bleak does not expose MTU acquisition; using the reported "
+                            f"MTU of {self.client.mtu_size}")
+            return
+        try:
+            await acquire()
+            logger.info(f"ATT MTU for {self.name}: {self.client.mtu_size}")
+        except Exception as e:
+            logger.debug(f"Could not acquire MTU for {self.name}: {e}")
+
+    def mark_active(self):
+        """Record that the link just completed a GATT operation successfully."""
+        self.last_activity = asyncio.get_running_loop().time()
+
+    def is_recently_active(self, ttl: float) -> bool:
+        """Check whether the link completed a GATT operation within the last ttl seconds."""
+        return (self.is_connected and self.last_activity is not None
+                and asyncio.get_running_loop().time() - self.last_activity < ttl)
+
     async def _clear_system_connections(self):
         """
         Clear any existing system-level Bluetooth connections to prevent conflicts.
         
         On Linux systems (especially Raspberry Pi), orphaned Bluetooth connections
         can interfere with new BLE connections. This method uses system tools to
-        forcibly disconnect any existing connections to this device's address.
+        forcibly disconnect any existing connections to this device's address,
+        polling until the link is actually gone instead of sleeping a fixed delay.
         """
         try:
-            import subprocess
-            result = subprocess.run(
-                ['hcitool', 'con'], 
-                capture_output=True, 
-                text=True, 
-                timeout=5
-            )
+            if not await self._has_system_connection():
+                return
             
-            if self.address.upper() in result.stdout or self.address.lower() in result.stdout:
-                logger.info(f"Found existing connection to {self.address}, clearing...")
-                subprocess.run(
-                    ['sudo', 'hcitool', 'dc', self.address], 
-                    capture_output=True, 
-                    text=True, 
-                    timeout=5
-                )
-                await asyncio.sleep(1.0)
-                
-                # Backup disconnect method
-                subprocess.run(
-                    ['bluetoothctl', 'disconnect', self.address], 
-                    capture_output=True, 
-                    text=True, 
-                    timeout=5
-                )
-                await asyncio.sleep(0.5)
+            logger.info(f"Found existing connection to {self.address}, clearing...")
+            await run_command('sudo', 'hcitool', 'dc', self.address)
+            if await self._wait_system_disconnected(timeout=1.0):
+                return
+            
+            # Backup disconnect method
+            await run_command('bluetoothctl', 'disconnect', self.address)
+            await self._wait_system_disconnected(timeout=0.5)
                 
         except Exception as e:
             logger.debug(f"Could not clear system connections for {self.address}: {e}")
 
+    async def _has_system_connection(self) -> bool:
+        """Check whether the system Bluetooth stack lists a link to this device."""
+        _, output = await run_command('hcitool', 'con')
+        return self.address.upper() in output or self.address.lower() in output
+
+    async def _wait_system_disconnected(self, timeout: float, interval: float = 0.1) -> bool:
+        """
+        Poll the system Bluetooth stack until the link to this device is gone.
+        
+        Args:
+            timeout (float): Maximum time to wait in seconds
+            interval (float): Delay between two polls in seconds
+            
+        Returns:
+            bool: True if the link was released before the timeout, False otherwise
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            if not await self._has_system_connection():
+                return True
+            if loop.time() >= deadline:
+                return False
+            await asyncio.sleep(interval)
+
     async def connect(self, retries: int = 5) -> bool:
         """
         Establish BLE connection to the car with comprehensive retry logic.
@@ -109,12 +257,30 @@ class PDGCarDevice:
         - Connection health verification
         - Automatic device ID discovery
         
+        Concurrent callers share the attempt already in progress instead of
+        tearing down its client and starting a second one.
+        
         Args:
             retries (int): Maximum number of connection attempts
             
         Returns:
             bool: True if connection successful, False otherwise
         """
+        if self._connect_future is not None:
+            # Shielded so a waiter giving up does not affect the attempt's owner
+            return await asyncio.shield(self._connect_future)
+        
+        self._connect_future = future = asyncio.get_running_loop().create_future()
+        connected = False
+        try:
+            connected = await self._connect(retries)
+            return connected
+        finally:
+            self._connect_future = None
+            future.set_result(connected)
+    
+    async def _connect(self, retries: int) -> bool:
+        """Run the connection attempts for connect()."""
         # Clean up any previous connections
         if self.client:
             try:
@@ -135,7 +301,8 @@ class PDGCarDevice:
                 self.client = BleakClient(
                     self.device.address, 
                     adapter=self.adapter,
-                    timeout=15.0  # Extended timeout for Raspberry Pi
+                    timeout=15.0,  # Extended timeout for Raspberry Pi
+                    disconnected_callback=self._on_disconnected
                 )
                 
                 connect_task = asyncio.create_task(self.client.__aenter__())
@@ -148,6 +315,7 @@ class PDGCarDevice:
                 
                 await asyncio.sleep(0.5)  # Connection stabilization delay
                 self.is_connected = True
+                await self._acquire_mtu()
                 
                 # Read device ID if not already known
                 if not self.device_id:
@@ -167,6 +335,7 @@ class PDGCarDevice:
                     logger.warning(f"Could not read initial status from {self.name}: {e}")
                 
                 logger.info(f"Successfully connected to {self.name} on attempt {attempt}")
+                self.mark_active()
                 return True
                 
             except Exception as e:
@@ -256,6 +425,7 @@ class PDGCarDevice:
             raise RuntimeError("Device not connected")
         data = s.encode("utf-8")
         await self.client.write_gatt_char(char_uuid, data, response=True)
+        self.mark_active()
         logger.debug(f"Wrote string to {char_uuid}: '{s}' ({len(data)} bytes)")
 
     async def write_bool(self, char_uuid: str, value: bool):
@@ -264,6 +434,7 @@ class PDGCarDevice:
             raise RuntimeError("Device not connected")
         data = b"\x01" if value else b"\x00"
         await self.client.write_gatt_char(char_uuid, data, response=True)
+        self.mark_active()
         logger.debug(f"Wrote bool to {char_uuid}: {value} (0x{data.hex()})")
 
     async def write_i8(self, char_uuid: str, v: int):
@@ -274,6 +445,7 @@ class PDGCarDevice:
         clamped_value = clamp(v, -128, 127)
         data = struct.pack("b", clamped_value)
         await self.client.write_gatt_char(char_uuid, data, response=True)
+        self.mark_active()
         logger.debug(f"Wrote int8 to {char_uuid}: {v} -> {clamped_value} (0x{data.hex()})")
 
     async def write_u8(self, char_uuid: str, v: int):
@@ -284,6 +456,7 @@ class PDGCarDevice:
         clamped_value = clamp(v, 0, 255)
         data = struct.pack("B", clamped_value)
         await self.client.write_gatt_char(char_uuid, data, response=True)
+        self.mark_active()
         logger.debug(f"Wrote uint8 to {char_uuid}: {v} -> {clamped_value} (0x{data.hex()})")
 
     # BLE characteristic helpers - Read functions
@@ -454,11 +627,20 @@ class PDGCarDevice:
         if not self.is_connected or not self.client:
             raise RuntimeError("Device not connected")
         
-        # Use the enhanced write functions with proper bounds checking
-        await self.write_x_direction(x)
-        await self.write_y_direction(y) 
-        await self.write_speed_direction(speed)
-        await self.write_decay_mode(decay_mode)
+        # The firmware keeps each drive characteristic until it is written again, so
+        # only the values that changed since the last call on this link are sent
+        state = (clamp(x, -100, 100), clamp(y, -100, 100), clamp(speed, 0, 100), clamp(decay_mode, 0, 1))
+        previous = self._drive_state
+        self._drive_state = None  # Unknown until every write below has succeeded
+        if previous is None or previous[0] != state[0]:
+            await self.write_x_direction(x)
+        if previous is None or previous[1] != state[1]:
+            await self.write_y_direction(y)
+        if previous is None or previous[2] != state[2]:
+            await self.write_speed_direction(speed)
+        if previous is None or previous[3] != state[3]:
+            await self.write_decay_mode(decay_mode)
+        self._drive_state = state
         
         logger.info(f"Drive params sent to {self.name}: x={x}, y={y}, speed={speed}, decay_mode={decay_mode}")
 
@@ -537,11 +719,18 @@ class PDGCarDevice:
             return False
     
     def to_dict(self) -> dict:
-        """Convert device to dictionary representation."""
-        return {
-            "name": self.name,
-            "address": self.address,
-            "device_id": self.device_id,
-            "rssi": self.rssi,
-            "is_connected": self.is_connected
-        }
+        """
+        Convert device to dictionary representation.
+        
+        The dictionary is cached until the ID, RSSI or connection state changes,
+        so callers must treat it as read-only.
+        """
+        if self._dict_cache is None:
+            self._dict_cache = {
+                "name": self.name,
+                "address": self.address,
+                "device_id": self._device_id,
+                "rssi": self._rssi,
+                "is_connected": self._is_connected
+            }
+        return self._dict_cache
@@ -8,7 +8,11 @@ from typing import Dict, List, Optional, Callable
 from bleak import BleakScanner
 from bleak.backends.device import BLEDevice
 
-from .ble_constants import SERVICE_UUID, CAR_DEVICE_PREFIX
+from .ble_constants import (
+    SERVICE_UUID, CAR_DEVICE_PREFIX, SCAN_CONFIG, LINK_REUSE_TTL, COMMAND_MIN_INTERVAL,
+    KEEPALIVE_INTERVAL, KEEPALIVE_MAX_FAILURES, MAX_CONCURRENT_BLE_OPS, CONN_MIN_INTERVAL,
+    CONN_MAX_INTERVAL, BT_DEBUGFS_PATH, run_command
+)
 from .ble_device import PDGCarDevice
 
 logger = logging.getLogger(__name__)
@@ -26,10 +30,48 @@ class BLEService:
         self.scan_task: Optional[asyncio.Task] = None
         self.device_callbacks: List[Callable] = []
         self.adapter = adapter or "hci1"  # Default Bluetooth adapter for Raspberry Pi
+        # Bounds GATT writes in flight across all cars on this adapter. Only the writes
+        # take a slot: connects can take a minute and would starve every other car
+        self.ble_semaphore = asyncio.Semaphore(MAX_CONCURRENT_BLE_OPS)
         # Phase management for scan/control workflow
-        self.current_phase = "scan"  # "scan" or "control"
+        self._current_phase = "scan"  # "scan" or "control"
         self.phase_callbacks: List[Callable] = []
+        # Event loop time of the last command written to each car, for pacing
+        self._last_command_at: Dict[str, float] = {}
+        # Reconnects dropped cars in the background while in control phase
+        self.keepalive_task: Optional[asyncio.Task] = None
+        # Reconnect attempt started by the keepalive; left to finish when the loop stops
+        self._keepalive_connect: Optional[asyncio.Task] = None
+        # Per-address (failed attempts, loop time of the next allowed attempt)
+        self._keepalive_backoff: Dict[str, tuple] = {}
 
+    @property
+    def current_phase(self) -> str:
+        """Current workflow phase, "scan" or "control"."""
+        return self._current_phase
+    
+    @current_phase.setter
+    def current_phase(self, phase: str):
+        if phase != self._current_phase:
+            self._current_phase = phase
+            if phase == "control":
+                self._keepalive_backoff.clear()  # Give cars given up on last phase another chance
+            self._update_ble_ready()
+    
+    def _update_ble_ready(self):
+        """
+        Recompute Car.ble_ready for every managed car.
+        
+        Called when the phase or the set of discovered devices changes, so the
+        drive command path can test one flag instead of re-checking both.
+        """
+        if not self.car_manager:
+            return
+        in_control = self._current_phase == "control"
+        devices = self.discovered_devices
+        for car in self.car_manager.get_all_cars():
+            car.ble_ready = in_control and car.ble_address in devices
+    
     def add_phase_callback(self, callback: Callable):
         """Add a callback to be called when phase changes."""
         self.phase_callbacks.append(callback)
@@ -70,8 +112,10 @@ class BLEService:
             return False
         return device.name.startswith(CAR_DEVICE_PREFIX)
     
-    async def discover_cars(self, timeout: float = 8.0) -> List[PDGCarDevice]:
+    async def discover_cars(self, timeout: float = None) -> List[PDGCarDevice]:
         """Discover PDG car devices via BLE with Raspberry Pi optimizations."""
+        if timeout is None:
+            timeout = SCAN_CONFIG.discovery_timeout
         logger.info(f"Scanning for Rocket League cars with service UUID {SERVICE_UUID} (timeout: {timeout}s)...")
         async with BLEService.ble_operation_lock:
             try:
@@ -79,12 +123,14 @@ class BLEService:
                 
                 # Store discovered devices with RSSI data
                 discovered_devices_with_rssi = {}
+                loop = asyncio.get_running_loop()
                 
                 def detection_callback(device: BLEDevice, advertisement_data):
                     if self.is_car_device(device):
                         discovered_devices_with_rssi[device.address] = {
                             'device': device,
-                            'rssi': advertisement_data.rssi
+                            'rssi': advertisement_data.rssi,
+                            'seen': loop.time()
                         }
                 
                 scanner = BleakScanner(
@@ -116,6 +162,7 @@ class BLEService:
                         existing_device = self.discovered_devices[ble_device.address]
                         existing_device.device = ble_device
                         existing_device.rssi = rssi_value
+                        existing_device.last_advertisement = device_info['seen']
                         cars.append(existing_device)
                         
                         if self.car_manager:
@@ -125,6 +172,7 @@ class BLEService:
                     # New car discovered
                     car_device = PDGCarDevice(ble_device, adapter=self.adapter)
                     car_device.rssi = rssi_value
+                    car_device.last_advertisement = device_info['seen']
                     cars.append(car_device)
                     
                     self.discovered_devices[ble_device.address] = car_device
@@ -137,6 +185,9 @@ class BLEService:
                     new_discoveries += 1
                     logger.info(f"Discovered new Rocket League car: {car_device.name} ({car_device.address}) RSSI: {rssi_value}")
                 
+                # New devices and cars, or a car's address changing, affect readiness
+                self._update_ble_ready()
+                
                 if new_discoveries > 0:
                     logger.info(f"BLE discovery complete. Found {new_discoveries} new cars, {len(cars)} total cars discovered.")
                 else:
@@ -154,14 +205,16 @@ class BLEService:
             logger.info("Switching from control phase to scan phase")
         
         self.current_phase = "scan"
+        self.stop_keepalive()
         logger.info("=== SCAN PHASE STARTED ===")
         
         # Discover cars
-        discovered_cars = await self.discover_cars(timeout=10.0)
+        discovered_cars = await self.discover_cars()
         
         if discovered_cars:
             logger.info(f"Found {len(discovered_cars)} cars, switching to control phase")
             self.current_phase = "control"
+            self.start_keepalive()
             self._notify_phase_callbacks("control", discovered_cars)
             logger.info("=== CONTROL PHASE STARTED ===")
         else:
@@ -174,6 +227,7 @@ class BLEService:
         """Manually switch to control phase."""
         if self.current_phase != "control":
             self.current_phase = "control"
+            self.start_keepalive()
             logger.info("=== SWITCHED TO CONTROL PHASE ===")
             self._notify_phase_callbacks("control", list(self.discovered_devices.values()))
     
@@ -181,9 +235,97 @@ class BLEService:
         """Manually switch back to scan phase."""
         if self.current_phase != "scan":
             self.current_phase = "scan"
+            self.stop_keepalive()
             logger.info("=== SWITCHED TO SCAN PHASE ===")
             self._notify_phase_callbacks("scan", [])
     
+    def start_keepalive(self):
+        """Start the background reconnect loop unless it is already running."""
+        if self.keepalive_task is None or self.keepalive_task.done():
+            self.keepalive_task = asyncio.create_task(self._keepalive_loop(KEEPALIVE_INTERVAL))
+    
+    def stop_keepalive(self):
+        """Stop the background reconnect loop, e.g. before scanning."""
+        if self.keepalive_task is not None:
+            self.keepalive_task.cancel()
+            self.keepalive_task = None
+    
+    async def stop_keepalive_and_wait(self):
+        """Stop the reconnect loop and wait for a reconnect attempt it started to finish."""
+        self.stop_keepalive()
+        pending = self._keepalive_connect
+        if pending is not None and not pending.done():
+            await asyncio.wait({pending})
+    
+    async def _keepalive_reconnect(self, device: PDGCarDevice) -> Optional[bool]:
+        """
+        Make one keepalive reconnect attempt under the BLE operation lock.
+        
+        Returns:
+            bool or None: Whether the device is connected, or None if another
+                operation held the lock and the attempt was skipped
+        """
+        lock = BLEService.ble_operation_lock
+        if lock.locked():
+            return None
+        # Uncontended, so acquired without yielding; held for the whole connect so
+        # it never overlaps a scan or a user connect
+        async with lock:
+            if device.is_connected:
+                return True
+            return await device.connect(retries=1)
+    
+    async def _keepalive_loop(self, interval: float):
+        """
+        Reconnect discovered cars whose link dropped, so the next command does
+        not have to pay for the connection.
+        
+        Cars are reconnected one at a time with a single attempt each, holding the
+        BLE operation lock for the attempt; the adapter reset fallback of
+        connect_to_device is left to explicit requests. A car is skipped while
+        another operation holds the lock, backs off exponentially after each
+        failure and is given up on after KEEPALIVE_MAX_FAILURES attempts, so a car
+        that is switched off does not keep the lock busy.
+        
+        Args:
+            interval (float): Seconds between passes
+        """
+        loop = asyncio.get_running_loop()
+        backoff = self._keepalive_backoff
+        while self.is_in_control_phase():
+            await asyncio.sleep(interval)
+            for device in list(self.discovered_devices.values()):
+                if not self.is_in_control_phase():
+                    break
+                if device.is_connected:
+                    backoff.pop(device.address, None)
+                    continue
+                failures, next_attempt = backoff.get(device.address, (0, 0.0))
+                if failures >= KEEPALIVE_MAX_FAILURES or loop.time() < next_attempt \
+                        or BLEService.ble_operation_lock.locked():
+                    continue
+                
+                # Shielded so stopping the loop never aborts a connect halfway;
+                # stop_keepalive_and_wait lets it finish
+                self._keepalive_connect = asyncio.ensure_future(self._keepalive_reconnect(device))
+                try:
+                    connected = await asyncio.shield(self._keepalive_connect)
+                except Exception as e:
+                    logger.debug(f"Keepalive could not reconnect {device.name}: {e}")
+                    connected = False
+                
+                if connected is None:
+                    continue  # Lock taken in the meantime; try again next pass
+                if connected:
+                    backoff.pop(device.address, None)
+                    self._notify_device_callbacks(device, "connected")
+                    logger.info(f"Keepalive reconnected {device.name}")
+                else:
+                    failures += 1
+                    backoff[device.address] = (failures, loop.time() + interval * (2 ** failures))
+                    if failures >= KEEPALIVE_MAX_FAILURES:
+                        logger.info(f"Keepalive giving up on {device.name} after {failures} attempts")
+    
     def get_current_phase(self) -> str:
         """Get the current phase."""
         return self.current_phase
@@ -199,27 +341,22 @@ class BLEService:
     async def check_existing_connections(self, address: str):
         """Check and clear existing connections to prevent conflicts (Raspberry Pi optimized)."""
         try:
-            import subprocess
-            
             # Check for existing connections using multiple methods
-            result = subprocess.run(['hcitool', 'con'], capture_output=True, text=True, timeout=5)
+            _, connections = await run_command('hcitool', 'con')
             address_found = False
-            if address.upper() in result.stdout or address.lower() in result.stdout:
+            if address.upper() in connections or address.lower() in connections:
                 address_found = True
                 logger.warning(f"Found existing hcitool connection to {address}")
                 
-                subprocess.run(['sudo', 'hcitool', 'dc', address], 
-                             capture_output=True, text=True, timeout=5)
+                await run_command('sudo', 'hcitool', 'dc', address)
                 await asyncio.sleep(1.0)
             
             # Check bluetoothctl connections
-            result = subprocess.run(['bluetoothctl', 'info', address], 
-                                  capture_output=True, text=True, timeout=5)
-            if 'Connected: yes' in result.stdout:
+            _, info = await run_command('bluetoothctl', 'info', address)
+            if 'Connected: yes' in info:
                 address_found = True
                 logger.warning(f"Found existing bluetoothctl connection to {address}")
-                subprocess.run(['bluetoothctl', 'disconnect', address], 
-                             capture_output=True, text=True, timeout=5)
+                await run_command('bluetoothctl', 'disconnect', address)
                 await asyncio.sleep(1.0)
             
             if address_found:
@@ -234,60 +371,84 @@ class BLEService:
     async def cleanup_stale_connections(self):
         """Clean up any stale connections to discovered devices."""
         logger.info("Cleaning up stale BLE connections...")
-        for address, device in self.discovered_devices.items():
-            if device.is_connected:
-                if not await device.is_connection_healthy():
-                    logger.warning(f"Found stale connection to {device.name}, cleaning up...")
-                    await device.disconnect()
+        connected = [device for device in self.discovered_devices.values() if device.is_connected]
+        # Probe every link concurrently rather than one health-check read after another
+        healthy = await asyncio.gather(*(device.is_connection_healthy() for device in connected))
+        for device, is_healthy in zip(connected, healthy):
+            if not is_healthy:
+                logger.warning(f"Found stale connection to {device.name}, cleaning up...")
+                await device.disconnect()
         logger.info("Stale connection cleanup complete")
 
+    async def tune_connection_parameters(self) -> bool:
+        """
+        Request short LE connection intervals from the adapter for new car links.
+        
+        Drive command latency is bounded by the connection interval, which BlueZ
+        defaults to 30-50 ms. The kernel applies the debugfs bounds to every
+        connection it opens afterwards. Minimum is written first so the pair never
+        passes through an invalid min > max state.
+        
+        Returns:
+            bool: True if both bounds were written
+        """
+        base = f"{BT_DEBUGFS_PATH}/{self.adapter}"
+        for name, value in (("conn_min_interval", CONN_MIN_INTERVAL),
+                            ("conn_max_interval", CONN_MAX_INTERVAL)):
+            try:
+                returncode, _ = await run_command('sudo', 'sh', '-c', f"echo {value} > {base}/{name}")
+            except Exception as e:
+                logger.debug("Could not set %s: %s", name, e)
+                return False
+            if returncode != 0:
+                logger.warning("Failed to set %s on %s (exit code %d); keeping kernel defaults",
+                               name, self.adapter, returncode)
+                return False
+        logger.info("Connection interval set to %d-%d (x1.25 ms) on %s",
+                    CONN_MIN_INTERVAL, CONN_MAX_INTERVAL, self.adapter)
+        return True
+
     async def reset_bluetooth_adapter(self):
         """Reset the Bluetooth adapter to clear stuck connections (Raspberry Pi optimized)."""
         try:
             logger.info("Resetting Bluetooth adapter...")
-            import subprocess
             
             # Disconnect all active car connections
             try:
-                result = subprocess.run(['hcitool', 'con'], capture_output=True, text=True, timeout=5)
-                if result.stdout and 'RL-CAR' in result.stdout:
+                _, connections = await run_command('hcitool', 'con')
+                if 'RL-CAR' in connections:
                     logger.info("Disconnecting active car connections...")
-                    subprocess.run(['sudo', 'hcitool', 'cc'], capture_output=True, text=True, timeout=5)
+                    await run_command('sudo', 'hcitool', 'cc')
                     await asyncio.sleep(1.0)
             except Exception as e:
                 logger.debug(f"Could not disconnect active connections: {e}")
             
             # Reset the adapter
             logger.info(f"Resetting adapter {self.adapter}...")
-            result = subprocess.run(['sudo', 'hciconfig', self.adapter, 'down'], 
-                                  capture_output=True, text=True, timeout=10)
-            if result.returncode != 0:
-                logger.warning(f"Failed to bring adapter down: {result.stderr}")
+            returncode, _ = await run_command('sudo', 'hciconfig', self.adapter, 'down', timeout=10)
+            if returncode != 0:
+                logger.warning(f"Failed to bring adapter down (exit code {returncode})")
             
             await asyncio.sleep(2.0)
             
-            result = subprocess.run(['sudo', 'hciconfig', self.adapter, 'up'], 
-                                  capture_output=True, text=True, timeout=10)
-            if result.returncode != 0:
-                logger.warning(f"Failed to bring adapter up: {result.stderr}")
+            returncode, _ = await run_command('sudo', 'hciconfig', self.adapter, 'up', timeout=10)
+            if returncode != 0:
+                logger.warning(f"Failed to bring adapter up (exit code {returncode})")
             
             await asyncio.sleep(2.0)
             
             # Reset via bluetoothctl
             try:
-                subprocess.run(['bluetoothctl', 'power', 'off'], 
-                             capture_output=True, text=True, timeout=5)
+                await run_command('bluetoothctl', 'power', 'off')
                 await asyncio.sleep(1.0)
-                subprocess.run(['bluetoothctl', 'power', 'on'], 
-                             capture_output=True, text=True, timeout=5)
+                await run_command('bluetoothctl', 'power', 'on')
                 await asyncio.sleep(1.5)
             except Exception as e:
                 logger.debug(f"Could not reset via bluetoothctl: {e}")
             
             # Verify adapter status
-            result = subprocess.run(['hciconfig', self.adapter], 
-                                  capture_output=True, text=True, timeout=5)
-            if 'UP RUNNING' in result.stdout:
+            _, adapter_info = await run_command('hciconfig', self.adapter)
+            if 'UP RUNNING' in adapter_info:
                 logger.info("Bluetooth adapter reset successful")
                 return True
             else:
@@ -298,6 +459,41 @@ class BLEService:
             logger.error(f"Failed to reset Bluetooth adapter: {e}")
             return False
 
+    async def _refresh_device_reference(self, device: PDGCarDevice, timeout: float) -> bool:
+        """Scan briefly for one device and update its BLE reference; return True if it was seen."""
+        address = device.address.lower()
+        fresh_device_with_rssi = None
+        
+        def detection_callback(ble_device: BLEDevice, advertisement_data):
+            nonlocal fresh_device_with_rssi
+            if ble_device.address.lower() == address:
+                fresh_device_with_rssi = {
+                    'device': ble_device,
+                    'rssi': advertisement_data.rssi
+                }
+        
+        try:
+            scanner = BleakScanner(
+                detection_callback=detection_callback,
+                service_uuids=[SERVICE_UUID],
+                adapter=self.adapter
+            )
+            
+            await scanner.start()
+            await asyncio.sleep(timeout)
+            await scanner.stop()
+        except Exception as e:
+            logger.warning(f"Failed to get fresh device reference: {e}, using cached reference")
+            return False
+        
+        if not fresh_device_with_rssi:
+            return False
+        
+        device.device = fresh_device_with_rssi['device']
+        device.rssi = fresh_device_with_rssi['rssi']
+        device.last_advertisement = asyncio.get_running_loop().time()
+        return True
+
     async def connect_to_device(self, address: str) -> Optional[PDGCarDevice]:
         """Connect to a specific device by address with enhanced Raspberry Pi logic."""
         if address not in self.discovered_devices:
@@ -312,51 +508,33 @@ class BLEService:
         async with BLEService.ble_operation_lock:
             device = self.discovered_devices[address]
             
-            # Check if already connected and responsive
+            # Check if already connected and responsive; a link that carried traffic
+            # recently is reused without another health-check round trip
             if device.is_connected and device.client:
+                if device.is_recently_active(LINK_REUSE_TTL):
+                    return device
                 try:
                     await device.client.read_gatt_char("7f1f9b2a-6a43-4f62-8c2a-b9d3c0e4a1f4")  # CHAR_STATUS
+                    device.mark_active()
                     logger.debug(f"Device {device.name} is already connected and responsive")
                     return device
                 except Exception as e:
                     logger.warning(f"Existing connection to {device.name} is stale: {e}")
                     await device.disconnect()
             
-            # Get fresh device reference for better reliability
-            fresh_device_found = False
-            try:
+            # Get fresh device reference for better reliability, unless the
+            # discovery scan has seen this car advertising recently
+            if device.last_advertisement is not None and \
+                    asyncio.get_running_loop().time() - device.last_advertisement < SCAN_CONFIG.advert_max_age:
+                logger.debug(f"Recent advertisement from {device.name}, skipping fresh scan")
+                fresh_device_found = True
+            else:
                 logger.info(f"Getting fresh device reference for {address}...")
-                
-                fresh_device_with_rssi = None
-                
-                def detection_callback(device: BLEDevice, advertisement_data):
-                    nonlocal fresh_device_with_rssi
-                    if device.address.lower() == address.lower():
-                        fresh_device_with_rssi = {
-                            'device': device,
-                            'rssi': advertisement_data.rssi
-                        }
-                
-                scanner = BleakScanner(
-                    detection_callback=detection_callback,
-                    service_uuids=[SERVICE_UUID],
-                    adapter=self.adapter
-                )
-                
-                await scanner.start()
-                await asyncio.sleep(5.0)
-                await scanner.stop()
-                
-                if fresh_device_with_rssi:
-                    device.device = fresh_device_with_rssi['device']
-                    device.rssi = fresh_device_with_rssi['rssi']
-                    fresh_device_found = True
-                    logger.info(f"Updated device reference for {device.name} (RSSI: {fresh_device_with_rssi['rssi']})")
+                fresh_device_found = await self._refresh_device_reference(device, SCAN_CONFIG.refresh_timeout)
+                if fresh_device_found:
+                    logger.info(f"Updated device reference for {device.name} (RSSI: {device.rssi})")
                 else:
                     logger.warning(f"Device {address} not found in fresh scan, using cached reference")
-                    
-            except Exception as e:
-                logger.warning(f"Failed to get fresh device reference: {e}, using cached reference")
             
             await asyncio.sleep(0.5)  # Let Bluetooth stack settle
             
@@ -376,38 +554,15 @@ class BLEService:
                 
                 # Refresh device reference after reset
                 if fresh_device_found:
-                    try:
-                        fresh_device_after_reset = None
-                        
-                        def reset_detection_callback(device: BLEDevice, advertisement_data):
-                            nonlocal fresh_device_after_reset
-                            if device.address.lower() == address.lower():
-                                fresh_device_after_reset = {
-                                    'device': device,
-                                    'rssi': advertisement_data.rssi
-                                }
-                        
-                        reset_scanner = BleakScanner(
-                            detection_callback=reset_detection_callback,
-                            service_uuids=[SERVICE_UUID],
-                            adapter=self.adapter
-                        )
-                        
-                        await reset_scanner.start()
-                        await asyncio.sleep(3.0)
-                        await reset_scanner.stop()
-                        
-                        if fresh_device_after_reset:
-                            device.device = fresh_device_after_reset['device']
-                            device.rssi = fresh_device_after_reset['rssi']
-                            
-                    except Exception as e:
-                        logger.debug(f"Could not refresh device after reset: {e}")
+                    await self._refresh_device_reference(device, 3.0)
                 
                 if await device.connect(retries=2):
                     connection_success = True
             
             if connection_success:
+                car = self.car_manager.get_car_by_ble_address(address) if self.car_manager else None
+                if car is not None:
+                    car.ble_ready = True  # Connected in control phase, whatever the last scan saw
                 self._notify_device_callbacks(device, "connected")
                 logger.info(f"Successfully connected to {device.name}")
                 return device
@@ -424,6 +579,7 @@ class BLEService:
     
     async def disconnect_all(self):
         """Disconnect from all connected devices."""
+        self.stop_keepalive()
         disconnection_tasks = []
         for device in self.discovered_devices.values():
             if device.is_connected:
@@ -452,11 +608,20 @@ class BLEService:
             # TODO: Define proper command characteristics in car firmware
             # Currently using SSID characteristic as test
             command_data = f"{command}:{data}".encode("utf-8")
-            await device.client.write_gatt_char("7f1f9b2a-6a43-4f62-8c2a-b9d3c0e4a1f1", command_data)  # CHAR_SSID
             
-            logger.info(f"Command '{command}' sent to {device.name}")
+            # Pace writes to one per connection interval instead of sleeping after
+            # each command; back-to-back writes would only pile up in the BLE stack
+            loop = asyncio.get_running_loop()
+            wait = self._last_command_at.get(ble_address, 0.0) + COMMAND_MIN_INTERVAL - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
             
-            await asyncio.sleep(1.0)  # Wait for response
+            async with self.ble_semaphore:
+                await device.client.write_gatt_char("7f1f9b2a-6a43-4f62-8c2a-b9d3c0e4a1f1", command_data)  # CHAR_SSID
+            self._last_command_at[ble_address] = loop.time()
+            device.mark_active()
+            
+            logger.info(f"Command '{command}' sent to {device.name}")
             
             return True
             
@@ -484,7 +649,8 @@ class BLEService:
                     logger.error(f"Failed to connect to {device.name}")
                     return False
             
-            return await device.set_wifi_credentials(ssid, password)
+            async with self.ble_semaphore:
+                return await device.set_wifi_credentials(ssid, password)
             
         except Exception as e:
             logger.error(f"Error setting WiFi on {device.name} ({ble_address}): {e}")
@@ -509,7 +675,7 @@ class BLEService:
             "is_in_control_phase": self.is_in_control_phase(),
             "is_in_scan_phase": self.is_in_scan_phase(),
             "total_discovered": len(self.discovered_devices),
-            "total_connected": len([d for d in self.discovered_devices.values() if d.is_connected]),
+            "total_connected": sum(1 for d in self.discovered_devices.values() if d.is_connected),
             "devices": self.get_discovered_devices()
         }
 
@@ -533,7 +699,8 @@ class BLEService:
                 if not await self.connect_to_device(ble_address):
                     logger.error(f"Failed to connect to {device.name}")
                     return False
-            await device.set_drive(x, y, speed, decay_mode)
+            async with self.ble_semaphore:
+                await device.set_drive(x, y, speed, decay_mode)
             return True
         except Exception as e:
             logger.error(f"Error sending drive params to {device.name}: {e}")
@@ -17,7 +17,7 @@ import asyncio
 import logging
 import sys
 import os
-from typing import List, Callable, Optional
+from typing import List, Callable
 
 # Import handling for both script and module execution
 if __name__ == "__main__":
@@ -26,13 +26,11 @@ if __name__ == "__main__":
     parent_dir = os.path.dirname(current_dir)
     sys.path.insert(0, parent_dir)
     
-    from bluetooth.ble_constants import SERVICE_UUID, check_bluetooth_dependencies
-    from bluetooth.ble_device import PDGCarDevice
+    from bluetooth.ble_constants import check_bluetooth_dependencies
     from bluetooth.ble_service import BLEService
 else:
     # Module mode: use standard relative imports
-    from .ble_constants import SERVICE_UUID, check_bluetooth_dependencies
-    from .ble_device import PDGCarDevice
+    from .ble_constants import check_bluetooth_dependencies
     from .ble_service import BLEService
 
 logger = logging.getLogger(__name__)
@@ -45,6 +43,8 @@ class BluetoothDevice:
     Provides a basic interface for representing discovered Bluetooth devices
     without the full BLE connection capabilities of PDGCarDevice.
     """
+    __slots__ = ("address", "name", "paired")
+    
     def __init__(self, address: str, name: str = "Unknown", paired: bool = False):
         self.address = address
         self.name = name
@@ -104,10 +104,12 @@ class BluetoothService:
             return
         
         self.is_auto_discovery_running = True
+        await self.ble_service.tune_connection_parameters()
         await self.ble_service.start_scan_phase()
     
     async def stop_auto_discovery(self):
         """Stop automatic device discovery."""
+        self.ble_service.stop_keepalive()
         if self.is_auto_discovery_running:
             self.is_auto_discovery_running = False
     
@@ -13,9 +13,18 @@ Key handler functions:
 - Service availability checking with graceful degradation
 """
 
+from encoding import dumps
+
 # Global Bluetooth service instance (injected by main application)
 bluetooth_service = None
 
+# Returned whenever no service is configured; encoded once since the WebSocket
+# dispatcher sends JSON text responses as-is
+_ERR_NO_BT_SERVICE = dumps({
+    "status": "error",
+    "message": "Bluetooth service not available"
+})
+
 def set_bluetooth_service(service):
     """
     Configure the global Bluetooth service for handler access.
@@ -64,10 +73,7 @@ def handle_get_bluetooth_status(data, car_manager=None):
                 "message": f"Error getting Bluetooth status: {str(e)}"
             }
     
-    return {
-        "status": "error",
-        "message": "Bluetooth service not available"
-    }
+    return _ERR_NO_BT_SERVICE
 
 def handle_start_bluetooth_scan(data, car_manager=None):
     """
@@ -110,10 +116,7 @@ def handle_start_bluetooth_scan(data, car_manager=None):
                 "message": f"Error during Bluetooth scan: {str(e)}"
             }
     
-    return {
-        "status": "error",
-        "message": "Bluetooth service not available"
-    }
+    return _ERR_NO_BT_SERVICE
 
 def handle_stop_bluetooth_scan(data, car_manager=None):
     """Handle stop Bluetooth scan requests."""
@@ -132,10 +135,7 @@ def handle_stop_bluetooth_scan(data, car_manager=None):
                 "message": f"Error stopping Bluetooth scan: {str(e)}"
             }
     
-    return {
-        "status": "error",
-        "message": "Bluetooth service not available"
-    }
+    return _ERR_NO_BT_SERVICE
 
 def handle_pair_bluetooth_device(data, car_manager=None):
     """Handle pair Bluetooth device requests."""
@@ -172,10 +172,7 @@ def handle_pair_bluetooth_device(data, car_manager=None):
                 "message": f"Error pairing device: {str(e)}"
             }
     
-    return {
-        "status": "error",
-        "message": "Bluetooth service not available"
-    }
+    return _ERR_NO_BT_SERVICE
 
 # Bluetooth handler mappings
 BLUETOOTH_HANDLERS = {
@@ -0,0 +1,43 @@
+"""
+JSON encoding for WebSocket messages.
+
+Kept at the top level, next to models, so the websocket and bluetooth packages
+can share it without importing each other.
+
+Responses are encoded, and incoming messages decoded, with orjson when it is
+installed and with the standard library json module otherwise. Both produce
+equivalent JSON text; orjson emits it without optional whitespace and does not
+escape non-ASCII characters. Decoding errors are json.JSONDecodeError either way.
+"""
+
+import json
+
+# Faster encoder with graceful fallback when it is not installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+if ORJSON_AVAILABLE:
+    def dumps(obj) -> str:
+        """
+        Encode an object as JSON text.
+        
+        Args:
+            obj: JSON-serializable object (dict keys need not be strings)
+            
+        Returns:
+            str: JSON text
+        """
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    
+    # orjson caches the str objects of short object keys, so the keys of every
+    # incoming message ("action", "car", ...) are shared rather than re-created
+    loads = orjson.loads
+else:
+    dumps = json.dumps
+    loads = json.loads
+
+__all__ = ['dumps', 'loads', 'ORJSON_AVAILABLE']
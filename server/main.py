@@ -1,9 +1,15 @@
 import asyncio
 import logging
-from websocket import start_server_with_cars
-from models import Car, CarManager
+from websocket import start_server_with_cars, invalidate_bt_service_cache, cancel_all_drive_consumers
+from models import CarManager
 from bluetooth import BluetoothService, check_bluetooth_dependencies, set_bluetooth_service
 
+# libuv-based event loop with graceful fallback to the default asyncio loop
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # Configure application-wide logging for debugging and monitoring
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -51,22 +57,23 @@ async def start_bluetooth_service(car_manager: CarManager):
     
     # Configure device event logging and car manager synchronization
     def device_callback(device, event):
-        logger.info(f"Bluetooth event: {event} - {device}")
+        logger.info("Bluetooth event: %s - %s", event, device)
         
-        # Log updated car inventory after device state changes
-        if event == "discovered":
-            logger.info(f"Car manager now has {car_manager.get_car_count()} cars:")
+        # Log updated car inventory after device state changes; skip formatting
+        # every car entirely when INFO is filtered out
+        if event == "discovered" and logger.isEnabledFor(logging.INFO):
+            logger.info("Car manager now has %d cars:", car_manager.get_car_count())
             for car in car_manager.get_all_cars():
-                logger.info(f"  {car}")
+                logger.info("  %s", car)
     
     bluetooth_service.add_device_callback(device_callback)
     
     # Log existing paired devices from previous sessions
     paired_devices = bluetooth_service.get_paired_devices()
-    if paired_devices:
-        logger.info(f"Found {len(paired_devices)} already paired devices:")
+    if paired_devices and logger.isEnabledFor(logging.INFO):
+        logger.info("Found %d already paired devices:", len(paired_devices))
         for device in paired_devices:
-            logger.info(f"  {device}")
+            logger.info("  %s", device)
     
     # Start continuous device discovery using scan/advertise cycles
     discovery_task = asyncio.create_task(bluetooth_service.start_auto_discovery())
@@ -107,8 +114,11 @@ async def main():
         logger.info("Received interrupt signal, shutting down...")
     finally:
         # Ensure clean shutdown of all async resources
+        cancel_all_drive_consumers()
         if bluetooth_service:
             await bluetooth_service.stop_auto_discovery()
+            set_bluetooth_service(None)
+            invalidate_bt_service_cache()
         if discovery_task:
             discovery_task.cancel()
             try:
@@ -118,5 +128,8 @@ async def main():
         logger.info("Server shutdown complete")
 
 if __name__ == "__main__":
-    # Entry point: start the async application loop
-    asyncio.run(main())
+    # Entry point: start the async application loop, on uvloop when installed
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
@@ -2,10 +2,55 @@
 Data models for the Rocket League IRL server.
 """
 
+import json
+import logging
+import sys
+import time
+import zlib
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Movement states reported by cars; incoming values are interned to share these objects
+MOVES = tuple(sys.intern(move) for move in ("stopped", "forward", "backward", "left", "right"))
+
+# Fields that update_status may assign. The car ID, BLE identifiers and websocket_id
+# are left out: CarManager indexes cars by them, so they only change through it.
+# last_seen is a monotonic timestamp and only changes through Car._set_last_seen
+_CAR_FIELDS = frozenset((
+    "name", "battery_level", "move", "x", "boost", "boost_value", "connected"
+))
+
+# BLE advertisement name prefix of the cars (mirrors bluetooth.ble_constants.CAR_DEVICE_PREFIX)
+_BLE_NAME_PREFIX = "RL-CAR-"
+
+# Wire representation of boolean flags, indexed by the flag value
+_BOOL_STR = ("false", "true")
+
+# Discoveries of the same car closer together than this do not refresh last_seen
+LAST_SEEN_RESOLUTION_NS = 250_000_000
+
+# Offset between the wall clock and the monotonic clock, used to render last_seen
+_WALL_CLOCK_OFFSET_NS = time.time_ns() - time.monotonic_ns()
+
+
+def _format_timestamp(monotonic_ns: int) -> str:
+    """Render a time.monotonic_ns() timestamp as a local ISO 8601 string."""
+    return datetime.fromtimestamp((monotonic_ns + _WALL_CLOCK_OFFSET_NS) / 1e9).isoformat()
+
+
 class Car:
     """Represents a car in the Rocket League IRL game."""
     
-    def __init__(self, car_id, name="Unknown Car", ble_name=None, ble_address=None):
+    __slots__ = (
+        "car_id", "name", "ble_name", "ble_address", "battery_level", "move", "x",
+        "boost", "boost_value", "connected", "last_seen", "websocket_id", "ble_ready", "_manager",
+        "_status_cache", "_status_json", "_last_seen_iso"
+    )
+    
+    def __init__(self, car_id: int, name: str = "Unknown Car", ble_name: Optional[str] = None,
+                 ble_address: Optional[str] = None):
         """
         Initialize a new car.
         
@@ -15,38 +60,80 @@ class Car:
             ble_name (str): BLE device name (e.g., "RL-CAR-cc:ba:97:0d:8c:b5")
             ble_address (str): BLE MAC address
         """
-        self.car_id = car_id
-        self.name = name
-        self.ble_name = ble_name  # BLE device name
-        self.ble_address = ble_address  # BLE MAC address
-        self.battery_level = 100  # Battery level percentage (0-100)
-        self.move = "stopped"     # Current movement: stopped, forward, backward, left, right
-        self.x = 0                # Steering direction (-100 to 100, left to right)
-        self.boost = False        # Whether boost is currently active
-        self.boost_value = 100    # Boost fuel level (0-100)
-        self.connected = False    # Whether the car is connected via Bluetooth
-        self.last_seen = None     # Timestamp of last BLE discovery
-        self.websocket_id = None  # WebSocket connection identifier that controls this car
-        
-    def update_status(self, **kwargs):
+        self.car_id: int = car_id
+        self.name: str = name
+        self.ble_name: Optional[str] = ble_name  # BLE device name
+        self.ble_address: Optional[str] = ble_address  # BLE MAC address
+        self.battery_level: int = 100  # Battery level percentage (0-100)
+        self.move: str = "stopped"     # Current movement: stopped, forward, backward, left, right
+        self.x: int = 0                # Steering direction (-100 to 100, left to right)
+        self.boost: bool = False       # Whether boost is currently active
+        self.boost_value: int = 100    # Boost fuel level (0-100)
+        self.connected: bool = False   # Whether the car is connected via Bluetooth
+        self.last_seen: Optional[int] = None     # time.monotonic_ns() of last BLE discovery
+        self.websocket_id: Optional[str] = None  # WebSocket connection identifier that controls this car
+        # Set by the BLE service: in control phase with this car's device discovered.
+        # None until the service has evaluated this car, e.g. for a car added outside a scan
+        self.ble_ready: Optional[bool] = None
+        self._manager: Optional["CarManager"] = None  # Owning CarManager, notified when the status changes
+        self._status_cache: Optional[dict] = None  # Last dict built by get_status, None when stale
+        self._status_json: Optional[str] = None  # get_status() encoded as JSON, None when stale
+        self._last_seen_iso: Optional[str] = None  # last_seen rendered as ISO 8601, None until needed
+        
+    def _invalidate(self) -> None:
+        """Drop the cached status and notify the owning manager that it changed."""
+        self._status_cache = None
+        self._status_json = None
+        if self._manager is not None:
+            self._manager._invalidate_snapshot()
+        
+    def _set_last_seen(self, monotonic_ns: int) -> None:
+        """Record a discovery time, dropping the formatted copy of the previous one."""
+        self.last_seen = monotonic_ns
+        self._last_seen_iso = None
+    
+    def update_status(self, **kwargs) -> None:
         """
         Update car status with provided parameters.
         
+        Only the status fields in _CAR_FIELDS are accepted. The car ID, BLE name
+        and address and websocket_id are indexed by CarManager and must change
+        through it (add_or_update_car_from_ble, select_car, free_car) so the
+        indexes stay in sync; last_seen changes on discovery. Other keys are
+        logged and ignored.
+        
         Args:
             **kwargs: Key-value pairs for status updates
         """
+        changed = False
         for key, value in kwargs.items():
-            if hasattr(self, key):
+            if key not in _CAR_FIELDS:
+                logger.warning("Car %s: update_status ignores %r, which is not a status field "
+                               "or is managed by CarManager", self.car_id, key)
+                continue
+            if getattr(self, key) != value:
+                if key == "move" and type(value) is str:
+                    value = sys.intern(value)
                 setattr(self, key, value)
+                changed = True
+        if changed:
+            self._invalidate()
     
-    def get_status(self):
+    def get_status(self) -> dict:
         """
         Get current car status as a dictionary.
         
+        The dictionary is cached until the car changes, so callers must treat
+        it as read-only.
+        
         Returns:
             dict: Current car status
         """
-        return {
+        if self._status_cache is not None:
+            return self._status_cache
+        if self._last_seen_iso is None and self.last_seen is not None:
+            self._last_seen_iso = _format_timestamp(self.last_seen)
+        self._status_cache = {
             "car": self.car_id,
             "name": self.name,
             "ble_name": self.ble_name,
@@ -54,20 +141,87 @@ class Car:
             "battery_level": self.battery_level,
             "move": self.move,
             "x": self.x,
-            "boost": str(self.boost).lower(),
+            "boost": _BOOL_STR[bool(self.boost)],
             "boost_value": self.boost_value,
             "connected": self.connected,
-            "last_seen": self.last_seen.isoformat() if self.last_seen else None,
+            "last_seen": self._last_seen_iso,
             "websocket_id": self.websocket_id,
             "selected": self.websocket_id is not None
         }
+        return self._status_cache
     
-    def __str__(self):
+    def get_status_json(self) -> str:
+        """
+        Get current car status encoded as a JSON object.
+        
+        Like get_status, the encoded string is cached until the car changes.
+        
+        Returns:
+            str: JSON encoding of get_status()
+        """
+        if self._status_json is None:
+            self._status_json = json.dumps(self.get_status())
+        return self._status_json
+    
+    def __str__(self) -> str:
         selected_status = f" [Selected by {self.websocket_id}]" if self.websocket_id else " [Available]"
         return f"Car {self.car_id} ({self.name}) - BLE: {self.ble_name} - Battery: {self.battery_level}%, Move: {self.move}, Boost: {self.boost}{selected_status}"
     
-    def __repr__(self):
+    def __repr__(self) -> str:
         return f"Car(car_id={self.car_id}, name='{self.name}', ble_name='{self.ble_name}')"
+    
+    def __eq__(self, other) -> bool:
+        # Cars are identified by their ID; compare pointers first as that is the common case
+        return self is other or (type(other) is Car and self.car_id == other.car_id)
+    
+    def __hash__(self) -> int:
+        return self.car_id
+
+
+# Outcome codes of CarManager.select_car and free_car
+CAR_OK = 0
+CAR_ALREADY_SELECTED = 1
+CAR_FREED = 2
+CAR_ALREADY_FREE = 3
+CAR_NOT_FOUND = 4
+CAR_TAKEN = 5
+CAR_NOT_OWNER = 6
+
+_CAR_OP_MESSAGES = {
+    CAR_OK: "Car {} successfully selected",
+    CAR_ALREADY_SELECTED: "Car {} is already selected by this client",
+    CAR_FREED: "Car {} has been freed",
+    CAR_ALREADY_FREE: "Car {} is already free",
+    CAR_NOT_FOUND: "Car {} not found",
+    CAR_TAKEN: "Car {} is already selected by another client",
+    CAR_NOT_OWNER: "Car {} is not selected by this client",
+}
+
+
+class CarOpResult:
+    """Outcome of a car selection operation; the user-facing message is built on demand."""
+    
+    __slots__ = ("ok", "code", "car_id", "car")
+    
+    def __init__(self, ok: bool, code: int, car_id: int, car: Optional[Car] = None):
+        """
+        Initialize an operation result.
+        
+        Args:
+            ok (bool): Whether the operation succeeded
+            code (int): One of the CAR_* outcome codes
+            car_id (int): ID of the car the operation targeted
+            car (Car): The selected car, when there is one
+        """
+        self.ok = ok
+        self.code = code
+        self.car_id = car_id
+        self.car = car
+    
+    @property
+    def message(self) -> str:
+        """Human-readable description of the outcome."""
+        return _CAR_OP_MESSAGES[self.code].format(self.car_id)
 
 
 class CarManager:
@@ -75,18 +229,61 @@ class CarManager:
     
     def __init__(self):
         """Initialize the car manager with an empty list of cars."""
-        self.cars = {}  # Dictionary mapping car_id to Car objects
+        self.cars: Dict[int, Car] = {}  # Dictionary mapping car_id to Car objects
+        self._snapshot_json: Optional[str] = None  # Cached JSON array of all car statuses
+        self._by_ble_name: Dict[str, Car] = {}  # Secondary index: BLE device name -> Car
+        self._by_ble_address: Dict[str, Car] = {}  # Secondary index: BLE MAC address -> Car
+        self._by_ws: Dict[str, Set[int]] = {}  # WebSocket ID -> IDs of the cars it has selected
+        self._free: Set[int] = set()  # IDs of the cars not selected by any WebSocket
+    
+    def _invalidate_snapshot(self) -> None:
+        """Drop the cached status snapshot after any car change."""
+        self._snapshot_json = None
+    
+    def _index_ble(self, car: Car) -> None:
+        """Register a car's BLE name and address in the lookup indexes."""
+        if car.ble_name:
+            self._by_ble_name[car.ble_name] = car
+        if car.ble_address:
+            self._by_ble_address[car.ble_address] = car
+    
+    def _unindex_ble(self, car: Car) -> None:
+        """Remove a car's BLE name and address from the lookup indexes."""
+        if self._by_ble_name.get(car.ble_name) is car:
+            del self._by_ble_name[car.ble_name]
+        if self._by_ble_address.get(car.ble_address) is car:
+            del self._by_ble_address[car.ble_address]
     
-    def add_car(self, car):
+    def _release(self, car: Car) -> None:
+        """Drop a car from the selection indexes."""
+        self._free.discard(car.car_id)
+        owned = self._by_ws.get(car.websocket_id)
+        if owned is not None:
+            owned.discard(car.car_id)
+            if not owned:
+                del self._by_ws[car.websocket_id]
+    
+    def add_car(self, car: Car) -> None:
         """
         Add a car to the manager.
         
         Args:
             car (Car): Car object to add
         """
+        previous = self.cars.get(car.car_id)
+        if previous is not None:
+            self._release(previous)
+            self._unindex_ble(previous)
         self.cars[car.car_id] = car
+        car._manager = self
+        self._index_ble(car)
+        if car.websocket_id is None:
+            self._free.add(car.car_id)
+        else:
+            self._by_ws.setdefault(car.websocket_id, set()).add(car.car_id)
+        self._invalidate_snapshot()
     
-    def get_car(self, car_id):
+    def get_car(self, car_id: int) -> Optional[Car]:
         """
         Get a car by its ID.
         
@@ -98,16 +295,41 @@ class CarManager:
         """
         return self.cars.get(car_id)
     
-    def get_all_cars(self):
+    def get_all_cars(self) -> Iterable[Car]:
         """
         Get all cars.
         
         Returns:
-            list: List of all Car objects
+            Iterable[Car]: Read-only view of all Car objects; copy it with list()
+            before adding or removing cars while iterating
         """
-        return list(self.cars.values())
+        return self.cars.values()
     
-    def remove_car(self, car_id):
+    def get_all_statuses(self) -> List[dict]:
+        """
+        Get the status of every car in one pass.
+        
+        Returns:
+            list: Cached status dictionaries of all cars, in insertion order
+        """
+        return [car.get_status() for car in self.cars.values()]
+    
+    def snapshot_json(self) -> str:
+        """
+        Get the status of every car encoded as a single JSON array.
+        
+        The encoded array is cached and only rebuilt after a car has been added,
+        removed or changed, so repeated inventory requests share one encode. A
+        rebuild reuses the cached encoding of every car that did not change.
+        
+        Returns:
+            str: JSON array of car status dictionaries
+        """
+        if self._snapshot_json is None:
+            self._snapshot_json = "[" + ", ".join(car.get_status_json() for car in self.cars.values()) + "]"
+        return self._snapshot_json
+    
+    def remove_car(self, car_id: int) -> bool:
         """
         Remove a car by its ID.
         
@@ -117,12 +339,16 @@ class CarManager:
         Returns:
             bool: True if car was removed, False if not found
         """
-        if car_id in self.cars:
-            del self.cars[car_id]
-            return True
-        return False
+        car = self.cars.pop(car_id, None)
+        if car is None:
+            return False
+        car._manager = None
+        self._unindex_ble(car)
+        self._release(car)
+        self._invalidate_snapshot()
+        return True
     
-    def update_car_status(self, car_id, **kwargs):
+    def update_car_status(self, car_id: int, **kwargs) -> bool:
         """
         Update the status of a specific car.
         
@@ -139,7 +365,7 @@ class CarManager:
             return True
         return False
     
-    def get_car_count(self):
+    def get_car_count(self) -> int:
         """
         Get the total number of cars.
         
@@ -148,7 +374,7 @@ class CarManager:
         """
         return len(self.cars)
     
-    def get_car_by_ble_name(self, ble_name):
+    def get_car_by_ble_name(self, ble_name: str) -> Optional[Car]:
         """
         Get a car by its BLE device name.
         
@@ -158,12 +384,9 @@ class CarManager:
         Returns:
             Car or None: Car object if found, None otherwise
         """
-        for car in self.cars.values():
-            if car.ble_name == ble_name:
-                return car
-        return None
+        return self._by_ble_name.get(ble_name)
     
-    def get_car_by_ble_address(self, ble_address):
+    def get_car_by_ble_address(self, ble_address: str) -> Optional[Car]:
         """
         Get a car by its BLE MAC address.
         
@@ -173,12 +396,9 @@ class CarManager:
         Returns:
             Car or None: Car object if found, None otherwise
         """
-        for car in self.cars.values():
-            if car.ble_address == ble_address:
-                return car
-        return None
+        return self._by_ble_address.get(ble_address)
     
-    def add_or_update_car_from_ble(self, ble_name, ble_address):
+    def add_or_update_car_from_ble(self, ble_name: str, ble_address: str) -> Car:
         """
         Add a new car or update existing car based on BLE discovery.
         
@@ -189,16 +409,22 @@ class CarManager:
         Returns:
             Car: The car object (new or existing)
         """
-        from datetime import datetime
-        
         # Check if car already exists by BLE name or address
         existing_car = self.get_car_by_ble_name(ble_name) or self.get_car_by_ble_address(ble_address)
         
         if existing_car:
-            # Update existing car
-            existing_car.ble_name = ble_name
-            existing_car.ble_address = ble_address
-            existing_car.last_seen = datetime.now()
+            now = time.monotonic_ns()
+            # Update existing car, keeping the BLE indexes in step with its identifiers
+            if existing_car.ble_name != ble_name or existing_car.ble_address != ble_address:
+                self._unindex_ble(existing_car)
+                existing_car.ble_name = ble_name
+                existing_car.ble_address = ble_address
+                self._index_ble(existing_car)
+            elif existing_car.last_seen is not None and now - existing_car.last_seen < LAST_SEEN_RESOLUTION_NS:
+                # Advertisement burst: keep the cached status instead of rebuilding it
+                return existing_car
+            existing_car._set_last_seen(now)
+            existing_car._invalidate()
             return existing_car
         else:
             # Create new car
@@ -214,12 +440,12 @@ class CarManager:
                 ble_name=ble_name,
                 ble_address=ble_address
             )
-            new_car.last_seen = datetime.now()
+            new_car._set_last_seen(time.monotonic_ns())
             
             self.add_car(new_car)
             return new_car
     
-    def _generate_car_id_from_ble_name(self, ble_name):
+    def _generate_car_id_from_ble_name(self, ble_name: str) -> int:
         """
         Generate a unique car ID from BLE name.
         
@@ -229,19 +455,22 @@ class CarManager:
         Returns:
             int: Generated car ID
         """
-        if ble_name and "RL-CAR-" in ble_name:
-            # Extract MAC address and convert to a hash for car ID
-            mac_part = ble_name.replace("RL-CAR-", "").replace(":", "")
-            # Use last 4 characters of MAC as car ID to keep it simple
+        if ble_name and ble_name.startswith(_BLE_NAME_PREFIX):
             try:
-                return int(mac_part[-4:], 16)  # Convert hex to int
+                if len(ble_name) == 24 and ble_name[-3] == ":":
+                    # Canonical "RL-CAR-xx:xx:xx:xx:xx:xx" layout: decode the last two
+                    # MAC bytes straight from their fixed offsets
+                    return (int(ble_name[-5:-3], 16) << 8) | int(ble_name[-2:], 16)
+                # Otherwise use the last 2 bytes of the MAC as car ID
+                mac_part = ble_name[len(_BLE_NAME_PREFIX):].replace(":", "")
+                return int(mac_part[-4:], 16)
             except ValueError:
                 pass
         
-        # Fallback: use hash of the BLE name
-        return abs(hash(ble_name)) % 10000
+        # Fallback: CRC32 of the BLE name, stable across restarts unlike hash()
+        return zlib.crc32(str(ble_name).encode("utf-8")) & 0xFFFF
     
-    def _extract_car_name_from_ble_name(self, ble_name):
+    def _extract_car_name_from_ble_name(self, ble_name: str) -> str:
         """
         Extract a readable car name from BLE device name.
         
@@ -251,12 +480,12 @@ class CarManager:
         Returns:
             str: Readable car name
         """
-        if ble_name and "RL-CAR-" in ble_name:
-            mac_part = ble_name.replace("RL-CAR-", "")
+        if ble_name and ble_name.startswith(_BLE_NAME_PREFIX):
+            mac_part = ble_name.removeprefix(_BLE_NAME_PREFIX)
             return f"Rocket League Car ({mac_part[-8:]})"  # Use last 8 chars of MAC
         return f"Unknown Car ({ble_name})"
     
-    def select_car(self, car_id, websocket_id):
+    def select_car(self, car_id: int, websocket_id: str) -> CarOpResult:
         """
         Select/assign a car to a websocket connection.
         
@@ -265,22 +494,25 @@ class CarManager:
             websocket_id (str): Unique identifier for the websocket connection
             
         Returns:
-            tuple: (success: bool, message: str, car: Car or None)
+            CarOpResult: Outcome, carrying the car when the selection succeeded
         """
         car = self.get_car(car_id)
         if not car:
-            return False, f"Car {car_id} not found", None
+            return CarOpResult(False, CAR_NOT_FOUND, car_id)
         
         if car.websocket_id is not None:
             if car.websocket_id == websocket_id:
-                return True, f"Car {car_id} is already selected by this client", car
+                return CarOpResult(True, CAR_ALREADY_SELECTED, car_id, car)
             else:
-                return False, f"Car {car_id} is already selected by another client", None
+                return CarOpResult(False, CAR_TAKEN, car_id)
         
         car.websocket_id = websocket_id
-        return True, f"Car {car_id} successfully selected", car
+        self._free.discard(car_id)
+        self._by_ws.setdefault(websocket_id, set()).add(car_id)
+        car._invalidate()
+        return CarOpResult(True, CAR_OK, car_id, car)
     
-    def free_car(self, car_id, websocket_id=None):
+    def free_car(self, car_id: int, websocket_id: Optional[str] = None) -> CarOpResult:
         """
         Free/release a car from its websocket connection.
         
@@ -289,23 +521,26 @@ class CarManager:
             websocket_id (str, optional): WebSocket ID that should own the car (for verification)
             
         Returns:
-            tuple: (success: bool, message: str)
+            CarOpResult: Outcome of the operation
         """
         car = self.get_car(car_id)
         if not car:
-            return False, f"Car {car_id} not found"
+            return CarOpResult(False, CAR_NOT_FOUND, car_id)
         
         if car.websocket_id is None:
-            return True, f"Car {car_id} is already free"
+            return CarOpResult(True, CAR_ALREADY_FREE, car_id)
         
         # If websocket_id is provided, verify ownership
         if websocket_id is not None and car.websocket_id != websocket_id:
-            return False, f"Car {car_id} is not selected by this client"
+            return CarOpResult(False, CAR_NOT_OWNER, car_id)
         
+        self._release(car)
         car.websocket_id = None
-        return True, f"Car {car_id} has been freed"
+        self._free.add(car_id)
+        car._invalidate()
+        return CarOpResult(True, CAR_FREED, car_id)
     
-    def free_cars_by_websocket(self, websocket_id):
+    def free_cars_by_websocket(self, websocket_id: str) -> List[int]:
         """
         Free all cars assigned to a specific websocket connection.
         
@@ -315,23 +550,28 @@ class CarManager:
         Returns:
             list: List of car IDs that were freed
         """
-        freed_cars = []
-        for car in self.cars.values():
-            if car.websocket_id == websocket_id:
-                car.websocket_id = None
-                freed_cars.append(car.car_id)
-        return freed_cars
+        freed_ids = self._by_ws.pop(websocket_id, None)
+        if not freed_ids:
+            return []
+        for car_id in freed_ids:
+            car = self.cars[car_id]
+            car.websocket_id = None
+            car._invalidate()
+        self._free.update(freed_ids)
+        return list(freed_ids)
     
-    def get_free_cars(self):
+    def get_free_cars(self) -> List[Car]:
         """
         Get all cars that are not currently selected by any websocket.
         
         Returns:
-            list: List of Car objects that are available
+            list: List of Car objects that are available, ordered by car ID
         """
-        return [car for car in self.cars.values() if car.websocket_id is None]
+        cars = self.cars
+        # Sorted so clients picking the "first free" car get a stable answer
+        return [cars[car_id] for car_id in sorted(self._free)]
     
-    def get_cars_by_websocket(self, websocket_id):
+    def get_cars_by_websocket(self, websocket_id: str) -> List[Car]:
         """
         Get all cars assigned to a specific websocket connection.
         
@@ -341,4 +581,5 @@ class CarManager:
         Returns:
             list: List of Car objects assigned to the websocket
         """
-        return [car for car in self.cars.values() if car.websocket_id == websocket_id]
+        cars = self.cars
+        return [cars[car_id] for car_id in self._by_ws.get(websocket_id, ())]
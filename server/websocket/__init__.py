@@ -13,5 +13,8 @@ Main entry points:
 """
 
 from .websocket import start_server, start_server_async, start_server_with_cars
+from .async_handlers import invalidate_bt_service_cache
+from .handlers import cancel_all_drive_consumers
 
-__all__ = ['start_server', 'start_server_async', 'start_server_with_cars']
+__all__ = ['start_server', 'start_server_async', 'start_server_with_cars', 'invalidate_bt_service_cache',
+           'cancel_all_drive_consumers']
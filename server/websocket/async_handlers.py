@@ -14,12 +14,265 @@ Key functions:
 """
 
 import asyncio
+import functools
 import logging
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, NamedTuple, Optional, Tuple, Union
 from bluetooth.handlers import get_bluetooth_service
+from encoding import dumps
+from .handlers import invalidate_ble_service_cache
+
+if TYPE_CHECKING:
+    from bluetooth.ble_device import PDGCarDevice
+    from bluetooth.ble_service import BLEService
+    from models import Car, CarManager
+
+# Handler responses are plain dicts, or JSON text when the handler encodes them itself
+Response = Union[Dict[str, Any], str]
 
 logger = logging.getLogger(__name__)
 
-async def handle_send_to_car_async(data, car_manager=None):
+# Static error responses, encoded once; encode_response sends JSON text as-is
+_ERR_NO_BT_SERVICE = dumps({
+    "status": "error",
+    "message": "Bluetooth service not initialized"
+})
+_ERR_SCAN_IN_PROGRESS = dumps({
+    "status": "error",
+    "message": "A scan is already in progress",
+    "phase": "scan"
+})
+_ERR_BLE_BUSY = dumps({
+    "status": "error",
+    "message": "A Bluetooth operation is in progress, try scanning again shortly"
+})
+
+# Serializes scan phase requests; BlueZ rejects a second concurrent discovery with InProgress
+_SCAN_LOCK = asyncio.Lock()
+
+# Upper bounds for BLE operations awaited by the handlers, in seconds. Connecting
+# may go through retries and an adapter reset, so it gets a much larger budget
+_CONNECT_TIMEOUT: float = 90.0
+_COMMAND_TIMEOUT: float = 20.0
+
+# In-flight send_to_car write per BLE address; a newer command to the same car
+# cancels the older one instead of racing it to the device
+_inflight: Dict[str, "asyncio.Future[Any]"] = {}
+
+# Connection attempt per BLE address, shared by every request that needs the car
+# connected while it is running
+_connecting: Dict[str, "asyncio.Future[Any]"] = {}
+
+# Token of the newest send_to_car command per BLE address; a command that waited
+# for the connection only writes its payload if it is still the newest
+_latest_command: Dict[str, object] = {}
+
+# Bluetooth service handle cached after the first successful lookup
+_BT_SERVICE: Optional[Any] = None
+
+
+def _bt() -> Optional[Any]:
+    """Return the Bluetooth service, resolving it only until it is first available."""
+    global _BT_SERVICE
+    if _BT_SERVICE is None:
+        _BT_SERVICE = get_bluetooth_service()
+    return _BT_SERVICE
+
+
+def invalidate_bt_service_cache() -> None:
+    """Forget the cached Bluetooth service, e.g. when it is shut down or replaced."""
+    global _BT_SERVICE
+    _BT_SERVICE = None
+    invalidate_ble_service_cache()
+
+
+async def _shielded(operation: Awaitable[Any], timeout: float) -> Any:
+    """
+    Await a BLE operation with a timeout, shielding it from handler cancellation.
+    
+    If the WebSocket task is cancelled (client gone), the operation keeps running
+    until the BLE stack is back in a consistent state instead of being torn down
+    mid-connect. If the timeout expires, the operation itself is cancelled.
+    
+    Args:
+        operation: Coroutine or future performing the BLE operation
+        timeout (float): Maximum time to wait in seconds
+        
+    Returns:
+        The result of the operation
+        
+    Raises:
+        asyncio.TimeoutError: If the operation does not finish in time
+    """
+    task = asyncio.ensure_future(operation)
+    try:
+        return await asyncio.wait_for(asyncio.shield(task), timeout=timeout)
+    except asyncio.TimeoutError:
+        task.cancel()
+        raise
+
+
+def _shared_connect(ble_service: "BLEService", address: str) -> "asyncio.Future[Any]":
+    """
+    Return the connection attempt in progress for an address, starting one if needed.
+    
+    The attempt is not tied to any single request: a request that times out or
+    goes away stops waiting for it without aborting it for the others.
+    
+    Args:
+        ble_service (BLEService): Service performing the connection
+        address (str): BLE address of the car
+        
+    Returns:
+        asyncio.Future: Task resolving to the connected device, or None on failure
+    """
+    task = _connecting.get(address)
+    if task is None:
+        task = asyncio.ensure_future(ble_service.connect_to_device(address))
+        _connecting[address] = task
+        
+        def forget(done: "asyncio.Future[Any]") -> None:
+            if _connecting.get(address) is done:
+                del _connecting[address]
+        task.add_done_callback(forget)
+    return task
+
+
+def _timeout_response(car_id: Any) -> Dict[str, Any]:
+    """Build the error response for a BLE operation that timed out."""
+    return {
+        "status": "error",
+        "message": f"BLE operation on car {car_id} timed out"
+    }
+
+
+# Car, BLE device and BLE service a car-targeted handler operates on
+class _CarTarget(NamedTuple):
+    car: "Car"
+    ble_device: "PDGCarDevice"
+    ble_service: "BLEService"
+
+# Checks a car must pass before a car-targeted handler touches BLE, in order,
+# with the error message returned for the first one that fails
+_CAR_PRECONDITIONS: Tuple[Tuple[Callable[[Optional["Car"]], Any], str], ...] = (
+    (lambda car: car is not None, "Car {car_id} not found"),
+    (lambda car: car.ble_address, "Car {car_id} has no BLE address"),
+)
+
+
+def _ws_handler(error_prefix: str):
+    """
+    Wrap an async handler with the shared timeout and error handling.
+    
+    A BLE timeout becomes the timeout response for the requested car; any other
+    exception is logged with its traceback and reported to the client.
+    
+    Args:
+        error_prefix (str): Start of the error message sent for unexpected exceptions
+        
+    Returns:
+        Decorator for an async handler taking (data, car_manager)
+    """
+    def decorator(handler: Callable[..., Awaitable[Response]]) -> Callable[..., Awaitable[Response]]:
+        @functools.wraps(handler)
+        async def wrapper(data: Dict[str, Any], car_manager: Optional["CarManager"] = None) -> Response:
+            try:
+                return await handler(data, car_manager)
+            except asyncio.TimeoutError:
+                logger.warning("Timed out in %s for car %s", handler.__name__, data.get("car"))
+                return _timeout_response(data.get("car"))
+            except Exception as e:
+                logger.exception("Error in %s", handler.__name__)
+                return {
+                    "status": "error",
+                    "message": f"{error_prefix}: {e}"
+                }
+        return wrapper
+    return decorator
+
+
+def _car_success(message: str, car: "Car", **extra: Any) -> Dict[str, Any]:
+    """
+    Build the success response of a car-targeted handler.
+    
+    Args:
+        message (str): Human readable outcome
+        car (Car): Car the operation targeted; its status is embedded
+        **extra: Handler specific payload entries (e.g. sent_data)
+        
+    Returns:
+        dict: Success response
+    """
+    response = {"status": "success", "message": message, **extra}
+    response["car"] = car.get_status()
+    return response
+
+
+def _car_success_json(message: str, car: "Car", **extra: Any) -> str:
+    """
+    Encoded variant of _car_success for hot paths.
+    
+    The car status is spliced in from its cached JSON encoding, so only the
+    handler specific part is encoded on each call.
+    
+    Returns:
+        str: JSON text of the same response _car_success would build
+    """
+    head = dumps({"status": "success", "message": message, **extra})
+    return f'{head[:-1]}, "car": {car.get_status_json()}}}'
+
+
+def _resolve_car_and_device(car_id: Any, car_manager: Optional["CarManager"]
+                            ) -> Union[_CarTarget, Response]:
+    """
+    Look up a car and its discovered BLE device for a car-targeted handler.
+    
+    Args:
+        car_id: Car ID taken from the WebSocket message
+        car_manager (CarManager): Car registry for device lookup
+        
+    Returns:
+        _CarTarget when every lookup succeeds, otherwise the error response
+    """
+    # Fast path for the usual valid request: plain lookups, with any failure
+    # (no manager or service, unknown car, missing address) diagnosed below
+    try:
+        car = car_manager.cars[car_id]
+        ble_service = _bt().ble_service
+        return _CarTarget(car, ble_service.discovered_devices[car.ble_address], ble_service)
+    except (AttributeError, KeyError, TypeError):
+        pass
+    
+    car = None
+    if car_manager and car_id is not None:
+        car = car_manager.get_car(car_id)
+    
+    for precondition, message in _CAR_PRECONDITIONS:
+        if not precondition(car):
+            return {
+                "status": "error",
+                "message": message.format(car_id=car_id)
+            }
+    
+    # Access the Bluetooth service for BLE operations
+    bluetooth_service = _bt()
+    if not bluetooth_service:
+        return _ERR_NO_BT_SERVICE
+    
+    # Locate the BLE device in the discovered devices registry
+    ble_service = bluetooth_service.ble_service
+    ble_device = ble_service.discovered_devices.get(car.ble_address)
+    if not ble_device:
+        return {
+            "status": "error",
+            "message": f"Car {car_id} BLE device not found. Try discovering cars first."
+        }
+    
+    return _CarTarget(car, ble_device, ble_service)
+
+
+@_ws_handler("Error sending to car")
+async def handle_send_to_car_async(data: Dict[str, Any],
+                                   car_manager: Optional["CarManager"] = None) -> Response:
     """
     Send commands and data to a specific car via Bluetooth Low Energy.
     
@@ -32,319 +285,266 @@ async def handle_send_to_car_async(data, car_manager=None):
         car_manager (CarManager): Car registry for device lookup
         
     Returns:
-        dict: Response with operation status and any error messages
+        dict or str: Response with operation status and any error messages; the
+            success response is returned already JSON encoded
     """
     car_id = data.get("car")
     command = data.get("command", "test")
     message = data.get("message", "Hello from server!")
     
-    logger.info(f"Sending to car {car_id}: command={command}, message={message}")
+    # Called for every command; skip building the argument tuple when INFO is off
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Sending to car %s: command=%s, message=%s", car_id, command, message)
+    
+    target = _resolve_car_and_device(car_id, car_manager)
+    if type(target) is not _CarTarget:
+        return target
+    car, ble_device, ble_service = target
     
+    superseded = {
+        "status": "error",
+        "message": f"Command '{command}' to car {car.name} was superseded by a newer command"
+    }
+    token = _latest_command[car.ble_address] = object()
     try:
-        # Validate car exists in the management system
-        car = None
-        if car_manager and car_id is not None:
-            car = car_manager.get_car(car_id)
-        
-        if not car:
-            return {
-                "status": "error",
-                "message": f"Car {car_id} not found"
-            }
-        
-        if not car.ble_address:
-            return {
-                "status": "error",
-                "message": f"Car {car_id} has no BLE address"
-            }
-        
-        # Access the Bluetooth service for BLE operations
-        bluetooth_service = get_bluetooth_service()
-        if not bluetooth_service:
-            return {
-                "status": "error",
-                "message": "Bluetooth service not initialized"
-            }
-        
-        # Locate the BLE device in the discovered devices registry
-        ble_devices = bluetooth_service.ble_service.discovered_devices
-        ble_device = ble_devices.get(car.ble_address)
-        
-        if not ble_device:
-            return {
-                "status": "error",
-                "message": f"Car {car_id} BLE device not found. Try discovering cars first."
-            }
-        
-        # Connect to the device if not already connected
         if not ble_device.is_connected:
-            logger.info(f"Connecting to {ble_device.name} to send command...")
-            connected = await ble_device.connect()
-            if not connected:
+            # Every command arriving while the car is connecting waits for the same
+            # attempt; only the newest one sends its payload once the link is up
+            connected_device = await asyncio.wait_for(
+                asyncio.shield(_shared_connect(ble_service, car.ble_address)),
+                timeout=_CONNECT_TIMEOUT
+            )
+            if _latest_command.get(car.ble_address) is not token:
+                return superseded
+            if not connected_device:
                 return {
                     "status": "error",
                     "message": f"Failed to connect to car {car.name} via BLE"
                 }
         
-        # Send the command via BLE
-        success = await bluetooth_service.send_command_to_car_async(
-            car.ble_address, 
-            command, 
-            message
-        )
-        
-        if success:
-            # Update car status to show communication
-            if car_manager:
-                car_manager.update_car_status(car_id, connected=True)
-            
-            return {
-                "status": "success",
-                "message": f"Command '{command}' sent to car {car.name}",
-                "sent_data": {
-                    "command": command,
-                    "message": message,
-                    "car_id": car_id,
-                    "ble_address": car.ble_address
-                },
-                "car": car.get_status()
-            }
-        else:
-            return {
-                "status": "error",
-                "message": f"Failed to send command to car {car.name}"
+        # A previous command still in its write phase is replaced by this one
+        previous_task = _inflight.get(car.ble_address)
+        if previous_task is not None and not previous_task.done():
+            previous_task.cancel()
+        
+        # Answer as soon as the link drops instead of waiting for the write to time out
+        send_task = asyncio.ensure_future(ble_device.run_while_connected(
+            ble_service.send_command_to_car(car.ble_address, command, message)
+        ))
+        _inflight[car.ble_address] = send_task
+        try:
+            success = await _shielded(send_task, _COMMAND_TIMEOUT)
+        finally:
+            if _inflight.get(car.ble_address) is send_task:
+                del _inflight[car.ble_address]
+    except ConnectionError:
+        return {
+            "status": "error",
+            "message": f"Car {car.name} disconnected while sending the command"
+        }
+    except asyncio.CancelledError:
+        # Only swallow the cancellation if a newer command superseded this one
+        if _latest_command.get(car.ble_address) is token:
+            raise
+        return superseded
+    finally:
+        if _latest_command.get(car.ble_address) is token:
+            del _latest_command[car.ble_address]
+    
+    if not success and not ble_device.is_connected:
+        return {
+            "status": "error",
+            "message": f"Failed to connect to car {car.name} via BLE"
+        }
+    
+    if success:
+        # Mark the car connected; skipped when it already is, so steady
+        # command traffic stays off the car manager entirely
+        if car_manager and not car.connected:
+            car_manager.update_car_status(car_id, connected=True)
+        
+        return _car_success_json(
+            f"Command '{command}' sent to car {car.name}",
+            car,
+            sent_data={
+                "command": command,
+                "message": message,
+                "car_id": car_id,
+                "ble_address": car.ble_address
             }
-        
-    except Exception as e:
-        logger.error(f"Error in handle_send_to_car_async: {e}")
+        )
+    else:
         return {
             "status": "error",
-            "message": f"Error sending to car: {str(e)}"
+            "message": f"Failed to send command to car {car.name}"
         }
 
-async def handle_set_wifi_credentials_async(data, car_manager=None):
+
+@_ws_handler("Error setting WiFi credentials")
+async def handle_set_wifi_credentials_async(data: Dict[str, Any],
+                                            car_manager: Optional["CarManager"] = None) -> Response:
     """Handle setting WiFi credentials on a car via Bluetooth (async version)."""
     car_id = data.get("car")
     ssid = data.get("ssid", "TestWiFi")
     password = data.get("password", "TestPassword123")
     
-    logger.info(f"Setting WiFi credentials on car {car_id}: SSID={ssid}")
+    logger.info("Setting WiFi credentials on car %s: SSID=%s", car_id, ssid)
     
-    try:
-        # Find the car
-        car = None
-        if car_manager and car_id is not None:
-            car = car_manager.get_car(car_id)
-        
-        if not car:
-            return {
-                "status": "error",
-                "message": f"Car {car_id} not found"
-            }
-        
-        if not car.ble_address:
-            return {
-                "status": "error",
-                "message": f"Car {car_id} has no BLE address"
-            }
-        
-        # Get the Bluetooth service
-        bluetooth_service = get_bluetooth_service()
-        if not bluetooth_service:
-            return {
-                "status": "error",
-                "message": "Bluetooth service not initialized"
-            }
-        
-        # Get the BLE device
-        ble_devices = bluetooth_service.ble_service.discovered_devices
-        ble_device = ble_devices.get(car.ble_address)
-        
-        if not ble_device:
+    target = _resolve_car_and_device(car_id, car_manager)
+    if type(target) is not _CarTarget:
+        return target
+    car, ble_device, ble_service = target
+    
+    # Connect to the device if not already connected
+    if not ble_device.is_connected:
+        logger.info("Connecting to %s to set WiFi credentials...", ble_device.name)
+        connected_device = await _shielded(
+            ble_service.connect_to_device(car.ble_address), _CONNECT_TIMEOUT
+        )
+        if not connected_device:
             return {
                 "status": "error",
-                "message": f"Car {car_id} BLE device not found. Try discovering cars first."
+                "message": f"Failed to connect to car {car.name} via BLE"
             }
-        
-        # Connect to the device if not already connected
-        if not ble_device.is_connected:
-            logger.info(f"Connecting to {ble_device.name} to set WiFi credentials...")
-            connected_device = await bluetooth_service.ble_service.connect_to_device(car.ble_address)
-            if not connected_device:
-                return {
-                    "status": "error",
-                    "message": f"Failed to connect to car {car.name} via BLE"
-                }
-        
-        # Set WiFi credentials using the new BLE service method
-        success = await bluetooth_service.ble_service.set_wifi_on_car(car.ble_address, ssid, password)
-        
-        if success:
-            # Update car status to show communication
-            if car_manager:
-                car_manager.update_car_status(car_id, connected=True)
-            
-            return {
-                "status": "success",
-                "message": f"WiFi credentials set on car {car.name}",
-                "wifi_data": {
-                    "ssid": ssid,
-                    "car_id": car_id,
-                    "ble_address": car.ble_address
-                },
-                "car": car.get_status()
-            }
-        else:
-            return {
-                "status": "error",
-                "message": f"Failed to set WiFi credentials on car {car.name}"
+    
+    # Set WiFi credentials using the new BLE service method
+    success = await _shielded(
+        ble_service.set_wifi_on_car(car.ble_address, ssid, password), _COMMAND_TIMEOUT
+    )
+    
+    if success:
+        # Mark the car connected; skipped when it already is, so steady
+        # command traffic stays off the car manager entirely
+        if car_manager and not car.connected:
+            car_manager.update_car_status(car_id, connected=True)
+        
+        return _car_success(
+            f"WiFi credentials set on car {car.name}",
+            car,
+            wifi_data={
+                "ssid": ssid,
+                "car_id": car_id,
+                "ble_address": car.ble_address
             }
-        
-    except Exception as e:
-        logger.error(f"Error in handle_set_wifi_credentials_async: {e}")
+        )
+    else:
         return {
             "status": "error",
-            "message": f"Error setting WiFi credentials: {str(e)}"
+            "message": f"Failed to set WiFi credentials on car {car.name}"
         }
 
-async def handle_connect_to_car_async(data, car_manager=None):
+
+@_ws_handler("Error connecting to car")
+async def handle_connect_to_car_async(data: Dict[str, Any],
+                                      car_manager: Optional["CarManager"] = None) -> Response:
     """Handle connecting to a car via Bluetooth (async version)."""
     car_id = data.get("car")
     
-    logger.info(f"Connecting to car {car_id} via BLE...")
+    logger.info("Connecting to car %s via BLE...", car_id)
     
-    try:
-        # Find the car
-        car = None
-        if car_manager and car_id is not None:
-            car = car_manager.get_car(car_id)
-        
-        if not car:
-            return {
-                "status": "error",
-                "message": f"Car {car_id} not found"
-            }
-        
-        if not car.ble_address:
-            return {
-                "status": "error",
-                "message": f"Car {car_id} has no BLE address"
-            }
-        
-        # Get the Bluetooth service
-        bluetooth_service = get_bluetooth_service()
-        if not bluetooth_service:
-            return {
-                "status": "error",
-                "message": "Bluetooth service not initialized"
-            }
-        
-        # Get the BLE device
-        ble_devices = bluetooth_service.ble_service.discovered_devices
-        ble_device = ble_devices.get(car.ble_address)
-        
-        if not ble_device:
-            return {
-                "status": "error",
-                "message": f"Car {car_id} BLE device not found. Try discovering cars first."
-            }
-        
-        # Connect to the device
-        if ble_device.is_connected:
-            return {
-                "status": "success",
-                "message": f"Car {car.name} is already connected",
-                "car": car.get_status()
-            }
-        
-        logger.info(f"Connecting to {ble_device.name}...")
-        connected_device = await bluetooth_service.ble_service.connect_to_device(car.ble_address)
-        
-        if connected_device:
-            # Update car status
-            if car_manager:
-                car_manager.update_car_status(car_id, connected=True)
-            
-            return {
-                "status": "success",
-                "message": f"Successfully connected to car {car.name}",
-                "car": car.get_status()
-            }
-        else:
-            return {
-                "status": "error",
-                "message": f"Failed to connect to car {car.name}"
-            }
-        
-    except Exception as e:
-        logger.error(f"Error in handle_connect_to_car_async: {e}")
+    target = _resolve_car_and_device(car_id, car_manager)
+    if type(target) is not _CarTarget:
+        return target
+    car, ble_device, ble_service = target
+    
+    # Connect to the device
+    if ble_device.is_connected:
+        return _car_success(f"Car {car.name} is already connected", car)
+    
+    # A connection to this car already in progress (another client, the keepalive)
+    # is joined instead of queueing a second attempt behind it
+    connected_device = None
+    if ble_device.is_connecting and \
+            await _shielded(ble_device.connect(), _CONNECT_TIMEOUT):
+        connected_device = ble_device
+    
+    if not connected_device:
+        logger.info("Connecting to %s...", ble_device.name)
+        connected_device = await asyncio.wait_for(
+            asyncio.shield(_shared_connect(ble_service, car.ble_address)),
+            timeout=_CONNECT_TIMEOUT
+        )
+    
+    if connected_device:
+        # Mark the car connected; skipped when it already is, so steady
+        # command traffic stays off the car manager entirely
+        if car_manager and not car.connected:
+            car_manager.update_car_status(car_id, connected=True)
+        
+        return _car_success(f"Successfully connected to car {car.name}", car)
+    else:
         return {
             "status": "error",
-            "message": f"Error connecting to car: {str(e)}"
+            "message": f"Failed to connect to car {car.name}"
         }
 
-async def handle_switch_to_scan_phase_async(data, car_manager=None):
+
+@_ws_handler("Error switching to scan phase")
+async def handle_switch_to_scan_phase_async(data: Dict[str, Any],
+                                            car_manager: Optional["CarManager"] = None) -> Response:
     """Handle switching to scan phase (async version)."""
+    # Answer right away rather than queueing another scan behind the running one
+    if _SCAN_LOCK.locked():
+        return _ERR_SCAN_IN_PROGRESS
+    
     logger.info("Switching to scan phase...")
     
-    try:
-        # Get the Bluetooth service
-        bluetooth_service = get_bluetooth_service()
-        if not bluetooth_service:
-            return {
-                "status": "error",
-                "message": "Bluetooth service not initialized"
-            }
-        
-        # Switch to scan phase and discover cars
-        discovered_cars = await bluetooth_service.ble_service.start_scan_phase()
-        
-        return {
-            "status": "success",
-            "message": f"Switched to scan phase. Found {len(discovered_cars)} cars.",
-            "phase": "scan",
-            "discovered_cars": [car.to_dict() for car in discovered_cars]
-        }
-        
-    except Exception as e:
-        logger.error(f"Error in handle_switch_to_scan_phase_async: {e}")
-        return {
-            "status": "error",
-            "message": f"Error switching to scan phase: {str(e)}"
-        }
+    # Get the Bluetooth service
+    bluetooth_service = _bt()
+    if not bluetooth_service:
+        return _ERR_NO_BT_SERVICE
+    
+    # The keepalive is background work: stop it and let a reconnect attempt it
+    # holds the lock for finish, rather than count it as busy
+    ble_service = bluetooth_service.ble_service
+    await ble_service.stop_keepalive_and_wait()
+    
+    # Starting discovery while a connection or command is outstanding makes the
+    # controller reject one of them, so report busy instead of scanning
+    if ble_service.ble_operation_lock.locked() or \
+            any(not task.done() for task in _inflight.values()) or _connecting:
+        if ble_service.is_in_control_phase():
+            ble_service.start_keepalive()
+        return _ERR_BLE_BUSY
+    
+    # Switch to scan phase and discover cars
+    async with _SCAN_LOCK:
+        discovered_cars = await ble_service.start_scan_phase()
+    
+    return {
+        "status": "success",
+        "message": f"Switched to scan phase. Found {len(discovered_cars)} cars.",
+        "phase": "scan",
+        "discovered_cars": [car.to_dict() for car in discovered_cars]
+    }
+
 
-async def handle_switch_to_control_phase_async(data, car_manager=None):
+@_ws_handler("Error switching to control phase")
+async def handle_switch_to_control_phase_async(data: Dict[str, Any],
+                                               car_manager: Optional["CarManager"] = None) -> Response:
     """Handle switching to control phase (async version)."""
     logger.info("Switching to control phase...")
     
-    try:
-        # Get the Bluetooth service
-        bluetooth_service = get_bluetooth_service()
-        if not bluetooth_service:
-            return {
-                "status": "error",
-                "message": "Bluetooth service not initialized"
-            }
-        
-        # Switch to control phase
-        await bluetooth_service.ble_service.switch_to_control_phase()
-        
-        return {
-            "status": "success",
-            "message": "Switched to control phase. You can now send commands to cars.",
-            "phase": "control",
-            "discovered_cars": [car.to_dict() for car in bluetooth_service.ble_service.discovered_devices.values()]
-        }
-        
-    except Exception as e:
-        logger.error(f"Error in handle_switch_to_control_phase_async: {e}")
-        return {
-            "status": "error",
-            "message": f"Error switching to control phase: {str(e)}"
-        }
+    # Get the Bluetooth service
+    bluetooth_service = _bt()
+    if not bluetooth_service:
+        return _ERR_NO_BT_SERVICE
+    
+    # Switch to control phase
+    ble_service = bluetooth_service.ble_service
+    await ble_service.switch_to_control_phase()
+    discovered_devices = ble_service.discovered_devices
+    
+    return {
+        "status": "success",
+        "message": "Switched to control phase. You can now send commands to cars.",
+        "phase": "control",
+        "discovered_cars": [device.to_dict() for device in discovered_devices.values()]
+    }
+
 
 # Export the async handler
-ASYNC_HANDLERS = {
+ASYNC_HANDLERS: Dict[str, Callable[..., Awaitable[Response]]] = {
     "send_to_car": handle_send_to_car_async,
     "set_wifi_credentials": handle_set_wifi_credentials_async,
     "connect_to_car": handle_connect_to_car_async,
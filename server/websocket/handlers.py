@@ -14,6 +14,8 @@ Handler categories:
 
 import asyncio
 import logging
+import struct
+from encoding import dumps
 
 # Bluetooth functionality with graceful degradation
 try:
@@ -28,6 +30,92 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Latest pending drive command per car ID, consumed by one long-lived task per car.
+# Holding at most one entry means a newer command replaces one not yet sent
+_drive_queues = {}
+# Seconds a queued drive command may wait for BLE before the backlog is reported
+_DRIVE_QUEUE_WARN_AFTER = 0.5
+# Last (drive_x, drive_y, speed, decay_mode) sent to each car ID and the event loop
+# time it was sent; repeats within _DRIVE_REWRITE_INTERVAL seconds are not re-sent
+_last_drive_params = {}
+_DRIVE_REWRITE_INTERVAL = 0.2
+
+# Consumer task per car ID; also keeps the tasks referenced, since the event loop
+# only holds weak references to them
+_drive_consumers = {}
+
+# Fixed error responses, encoded once; the dispatcher sends JSON text as-is
+_ERR_INVALID_JSON = dumps({
+    "status": "error",
+    "message": "Invalid JSON format"
+})
+_ERR_NO_CAR_MANAGER = dumps({
+    "status": "error",
+    "message": "Car manager not available"
+})
+_ERR_BT_NOT_AVAILABLE = dumps({
+    "status": "error",
+    "message": "Bluetooth service not available"
+})
+_ERR_BT_NOT_INITIALIZED = dumps({
+    "status": "error",
+    "message": "Bluetooth service not initialized"
+})
+
+def _action_error(action, message):
+    """Encode a fixed error response for an action once, at import time."""
+    return dumps({"status": "error", "action": action, "message": message})
+
+_ERR_GET_FREE_CARS_NO_MANAGER = _action_error("get_free_cars", "Car manager not available")
+_ERR_SELECT_NO_CAR_ID = _action_error("select_car", "Car ID is required")
+_ERR_SELECT_NO_MANAGER = _action_error("select_car", "Car manager not available")
+_ERR_SELECT_NO_WEBSOCKET = _action_error("select_car", "WebSocket ID not available")
+_ERR_FREE_NO_CAR_ID = _action_error("free_car", "Car ID is required")
+_ERR_FREE_NO_MANAGER = _action_error("free_car", "Car manager not available")
+
+# (snapshot, response) pair for get_all_cars; rebuilt when the snapshot changes
+_all_cars_response = (None, None)
+
+# Compact move_car acknowledgements, indexed by bluetooth_command_sent; sent instead
+# of the full response to binary move frames and to move_car with "compact" set
+_MOVE_ACKS = tuple(
+    dumps({"status": "success", "action": "move_car", "bluetooth_command_sent": sent})
+    for sent in (False, True)
+)
+
+# BLE service handle cached after the first successful lookup
+_BLE_SERVICE = None
+
+# Binary move frame: opcode, 16-bit car ID (car IDs come from the last two MAC
+# bytes), signed steering x, flags (bits 0-1 move code, bit 2 boost). Sent by
+# clients instead of a move_car JSON object
+OP_MOVE = 0x01
+_MOVE_FRAME = struct.Struct("<BHbB")
+_MOVE_CODES = ("stopped", "forward", "backward")
+_MOVE_FLAG_BOOST = 0x04
+
+# (drive_y, speed) for each movement command
+_MOVE_STILL = (0, 0)
+_MOVE_TABLE = {
+    "forward": (50, 50),    # Positive Y-axis, moderate base speed for control
+    "backward": (-50, 50),  # Negative Y-axis, same speed for consistent feel
+    "stopped": _MOVE_STILL, # No directional movement, complete stop
+}
+
+def _ble():
+    """Return the BLE service, resolving it only until it is first available."""
+    global _BLE_SERVICE
+    if _BLE_SERVICE is None:
+        bluetooth_service = get_bluetooth_service()
+        if bluetooth_service:
+            _BLE_SERVICE = bluetooth_service.ble_service
+    return _BLE_SERVICE
+
+def invalidate_ble_service_cache():
+    """Forget the cached BLE service, e.g. when it is shut down or replaced."""
+    global _BLE_SERVICE
+    _BLE_SERVICE = None
+
 def translate_move_to_drive_params(move, x, boost):
     """
     Convert high-level movement commands to low-level motor control parameters.
@@ -48,29 +136,13 @@ def translate_move_to_drive_params(move, x, boost):
             - speed: Motor speed magnitude (0 to 100)
             - decay_mode: Braking behavior (0=normal, 1=fast/boost)
     """
-    # Initialize with safe default values
-    drive_x = x  # Direct steering mapping from UI
-    drive_y = 0  # Forward/backward component
-    speed = 0    # Motor speed magnitude
-    decay_mode = 0  # Normal braking behavior
-    
-    # Map movement commands to motor directions
-    if move == "forward":
-        drive_y = 50   # Positive Y-axis for forward motion
-        speed = 50     # Moderate base speed for control
-    elif move == "backward":
-        drive_y = -50  # Negative Y-axis for reverse motion
-        speed = 50     # Same speed for consistent feel
-    elif move == "stopped":
-        drive_y = 0    # No directional movement
-        speed = 0      # Complete stop
+    # Map movement commands to motor directions; unknown moves keep the car still
+    drive_y, speed = _MOVE_TABLE.get(move, _MOVE_STILL)
     
     # Boost mode increases speed and changes braking characteristics
     if boost:
-        speed = 100    # Maximum speed for boost
-        decay_mode = 1 # boost decay mode
-        
-    return drive_x, drive_y, speed, decay_mode
+        return x, drive_y, 100, 1  # Maximum speed, boost decay mode
+    return x, drive_y, speed, 0    # Direct steering mapping, normal braking
 
 async def send_drive_command_to_car(car, move, x, boost):
     """
@@ -86,74 +158,198 @@ async def send_drive_command_to_car(car, move, x, boost):
         bool: True if command was sent successfully, False otherwise
     """
     try:
-        # Get the Bluetooth service
-        bluetooth_service = get_bluetooth_service()
-        if not bluetooth_service:
+        ble_service = _ble()
+        if ble_service is None:
             logger.warning("Bluetooth service not available for drive command")
             return False
         
-        # Check if car has BLE address
-        if not car.ble_address:
-            logger.warning(f"Car {car.car_id} has no BLE address")
-            return False
-        
-        # Check if BLE service is in control phase
-        if not bluetooth_service.ble_service.is_in_control_phase():
-            logger.warning("Cannot send drive command: BLE service is in scan phase")
-            return False
-        
-        # Check if car device is discovered
-        ble_devices = bluetooth_service.ble_service.discovered_devices
-        if car.ble_address not in ble_devices:
-            logger.warning(f"Car {car.car_id} BLE device not found in discovered devices")
+        # Maintained by the BLE service: set only in control phase for a car with
+        # a BLE address whose device has been discovered. None means the service
+        # has not evaluated this car yet, so check the phase and device directly
+        ready = car.ble_ready
+        if ready is None:
+            ready = ble_service.is_in_control_phase() and car.ble_address in ble_service.discovered_devices
+        if not ready:
+            logger.warning("Car %s is not ready for drive commands (scan phase or BLE device not discovered)", car.car_id)
             return False
         
         # Translate move command to drive parameters
-        drive_x, drive_y, speed, decay_mode = translate_move_to_drive_params(move, x, boost)
+        params = translate_move_to_drive_params(move, x, boost)
+        drive_x, drive_y, speed, decay_mode = params
+        
+        # The client repeats move_car while the joystick is held; an unchanged
+        # command sent moments ago is still in effect on the car
+        now = asyncio.get_running_loop().time()
+        last = _last_drive_params.get(car.car_id)
+        if last is not None and last[0] == params and now - last[1] < _DRIVE_REWRITE_INTERVAL:
+            return True
         
-        logger.info(f"Sending drive command to car {car.car_id}: move={move}, x={x}, boost={boost}")
-        logger.info(f"BLE drive params: X={drive_x}, Y={drive_y}, Speed={speed}, Decay={decay_mode}")
+        logger.info("Sending drive command to car %s: move=%s, x=%s, boost=%s", car.car_id, move, x, boost)
+        logger.info("BLE drive params: X=%s, Y=%s, Speed=%s, Decay=%s", drive_x, drive_y, speed, decay_mode)
         
-        # Send the drive command via BLE
-        success = await bluetooth_service.ble_service.set_drive_on_car(
+        # Send the drive command via BLE; the service bounds the GATT writes in flight
+        success = await ble_service.set_drive_on_car(
             car.ble_address, drive_x, drive_y, speed, decay_mode
         )
         
         if success:
-            logger.info(f"Drive command successfully sent to car {car.car_id}")
+            _last_drive_params[car.car_id] = (params, now)
+            logger.info("Drive command successfully sent to car %s", car.car_id)
             return True
         else:
-            logger.error(f"Failed to send drive command to car {car.car_id}")
+            logger.error("Failed to send drive command to car %s", car.car_id)
             return False
         
     except Exception as e:
-        logger.error(f"Error sending drive command to car {car.car_id}: {e}")
+        logger.error("Error sending drive command to car %s: %s", car.car_id, e)
+        return False
+
+async def _drive_consumer(car_id, car_manager, queue):
+    """
+    Send the drive commands queued for one car, one at a time.
+    
+    The car is looked up for each command, so a car removed from the registry
+    is never written to; its consumer then stops and forgets itself.
+    
+    Args:
+        car_id (int): ID of the car the commands are for
+        car_manager: Car registry, used to look up the car and mark it connected
+        queue (asyncio.Queue): Queue of (car_id, move, x, boost, queued_at) commands for the car
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        _, move, x, boost, queued_at = await queue.get()
+        car = car_manager.get_car(car_id)
+        if car is None:
+            logger.info("Car %s is gone, stopping its drive command consumer", car_id)
+            if _drive_queues.get(car_id) is queue:
+                del _drive_queues[car_id]
+                del _drive_consumers[car_id]
+            _last_drive_params.pop(car_id, None)
+            return
+        waited = loop.time() - queued_at
+        if waited > _DRIVE_QUEUE_WARN_AFTER:
+            # BLE writes are falling behind the client; commands are being coalesced
+            logger.warning("Drive command for car %s waited %.0f ms for BLE", car_id, waited * 1000)
+        try:
+            ble_success = await send_drive_command_to_car(car, move, x, boost)
+            if ble_success:
+                # Update car connection status
+                if not car.connected:
+                    car_manager.update_car_status(car_id, connected=True)
+                logger.info("Bluetooth drive command sent successfully to car %s", car_id)
+            else:
+                logger.warning("Bluetooth drive command failed for car %s", car_id)
+        except Exception as e:
+            logger.error("Error in Bluetooth drive command for car %s: %s", car_id, e)
+
+def queue_drive_command(car, car_manager, move, x, boost):
+    """
+    Queue a drive command for a car, replacing any command not yet sent.
+    
+    The car's consumer task is started on first use. Only the newest command
+    matters for driving, so commands arriving faster than BLE can write them
+    are coalesced instead of each becoming a separate write.
+    
+    Args:
+        car: Car object with BLE address
+        car_manager: Car registry, used to look up the car and mark it connected
+        move (str): Movement direction
+        x (int): Steering value
+        boost (bool): Boost enabled
+        
+    Returns:
+        bool: True if the command was queued, False if no event loop is available
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
         return False
+    
+    queue = _drive_queues.get(car.car_id)
+    if queue is None:
+        queue = asyncio.Queue(maxsize=1)
+        _drive_queues[car.car_id] = queue
+        _drive_consumers[car.car_id] = loop.create_task(_drive_consumer(car.car_id, car_manager, queue))
+    
+    try:
+        queue.get_nowait()  # Drop the stale command still waiting to be sent
+    except asyncio.QueueEmpty:
+        pass
+    queue.put_nowait((car.car_id, move, x, boost, loop.time()))
+    return True
+
+def cancel_drive_consumer(car_id):
+    """
+    Stop a car's drive command consumer and drop its queue, e.g. when the car is freed.
+    
+    A command still queued for the car is discarded. The consumer is started
+    again by the next command queued for the car.
+    
+    Args:
+        car_id (int): ID of the car
+    """
+    _drive_queues.pop(car_id, None)
+    _last_drive_params.pop(car_id, None)
+    task = _drive_consumers.pop(car_id, None)
+    if task is not None:
+        task.cancel()
+
+def cancel_all_drive_consumers():
+    """Stop every drive command consumer, e.g. on server shutdown."""
+    for car_id in list(_drive_consumers):
+        cancel_drive_consumer(car_id)
 
 __all__ = [
     'handle_move_car',
+    'handle_move_car_binary',
     'handle_get_car_status',
     'handle_get_all_cars',
     'handle_get_free_cars',
     'handle_select_car',
     'handle_free_car',
-    'handle_send_to_car',
-    'handle_connect_to_car',
     'handle_unknown_action', 
     'handle_invalid_json',
+    'cancel_drive_consumer',
+    'cancel_all_drive_consumers',
     'ACTION_HANDLERS'
 ]
 
+def _parse_boost(boost):
+    """
+    Convert a boost field to a boolean.
+    
+    Args:
+        boost: Raw boost value from the move message
+        
+    Returns:
+        bool: True if boost is enabled
+    """
+    # The app sends JSON booleans or the lowercase strings; match those without
+    # allocating, and keep the case-insensitive rule for any other spelling
+    if boost is True or boost == "true":
+        return True
+    if isinstance(boost, str):
+        return boost.lower() in ("true", "1")
+    return bool(boost)
+
 def handle_move_car(data, car_manager=None, websocket_id=None):
     """Handle car movement commands with automatic Bluetooth drive command integration."""
-    car_id = data.get("car")
-    move = data.get("move")  # forward, backward, stopped
+    # Clients always send car and move, so index directly and only fall back
+    # to the lenient lookups when a field is actually missing
+    try:
+        car_id = data["car"]
+        move = data["move"]  # forward, backward, stopped
+    except KeyError:
+        car_id = data.get("car")
+        move = data.get("move")
     x = data.get("x", 0)     # steering: -100 (full left) to 100 (full right)
-    boost = data.get("boost", "false")
+    boost = data.get("boost", False)
     
     # Validate x parameter
     try:
-        x = int(x)
+        if type(x) is not int:
+            x = int(x)
         if x < -100 or x > 100:
             return {
                 "status": "error",
@@ -167,7 +363,53 @@ def handle_move_car(data, car_manager=None, websocket_id=None):
             "message": f"Invalid x parameter: {x}. Must be an integer between -100 and 100"
         }
     
-    print(f"Car {car_id} moving {move} with x={x} and boost: {boost}")
+    return _apply_move(car_id, move, x, boost, car_manager, websocket_id,
+                       compact=data.get("compact", False))
+
+def handle_move_car_binary(frame, car_manager=None, websocket_id=None):
+    """
+    Handle a move command sent as a packed binary WebSocket frame.
+    
+    Joystick updates are the bulk of client traffic; the 5-byte frame carries
+    the same fields as move_car without JSON encoding on either side.
+    
+    Args:
+        frame (bytes): Binary frame laid out as _MOVE_FRAME
+        car_manager: Car registry
+        websocket_id (str): ID of the sending connection
+        
+    Returns:
+        str or dict: Same response as handle_move_car with "compact" set
+    """
+    try:
+        opcode, car_id, x, flags = _MOVE_FRAME.unpack(frame)
+    except struct.error:
+        return {
+            "status": "error",
+            "action": "move_car",
+            "message": f"Invalid binary frame: expected {_MOVE_FRAME.size} bytes, got {len(frame)}"
+        }
+    
+    if opcode != OP_MOVE:
+        return {
+            "status": "error",
+            "message": f"Unknown binary opcode: {opcode}"
+        }
+    
+    move_code = flags & 0x03
+    if move_code >= len(_MOVE_CODES) or x < -100 or x > 100:
+        return {
+            "status": "error",
+            "action": "move_car",
+            "message": f"Invalid binary move frame: x={x}, flags={flags:#04x}"
+        }
+    
+    return _apply_move(car_id, _MOVE_CODES[move_code], x, bool(flags & _MOVE_FLAG_BOOST),
+                       car_manager, websocket_id, compact=True)
+
+def _apply_move(car_id, move, x, boost, car_manager, websocket_id, compact=False):
+    """Apply a validated move command to a car and queue its BLE drive command."""
+    logger.debug("Car %s moving %s with x=%s and boost: %s", car_id, move, x, boost)
     
     # Update car status if car manager is available
     if car_manager and car_id is not None:
@@ -182,7 +424,7 @@ def handle_move_car(data, car_manager=None, websocket_id=None):
                 }
             
             # Convert boost string to boolean
-            boost_bool = boost.lower() == "true" if isinstance(boost, str) else bool(boost)
+            boost_bool = _parse_boost(boost)
             
             # Update car status
             car_manager.update_car_status(
@@ -192,29 +434,14 @@ def handle_move_car(data, car_manager=None, websocket_id=None):
                 boost=boost_bool
             )
             
-            # Try to send Bluetooth drive command asynchronously
-            async def send_bluetooth_command():
-                try:
-                    ble_success = await send_drive_command_to_car(car, move, x, boost_bool)
-                    if ble_success:
-                        # Update car connection status
-                        car_manager.update_car_status(car_id, connected=True)
-                        logger.info(f"Bluetooth drive command sent successfully to car {car_id}")
-                    else:
-                        logger.warning(f"Bluetooth drive command failed for car {car_id}")
-                except Exception as e:
-                    logger.error(f"Error in Bluetooth drive command for car {car_id}: {e}")
-            
-            # Schedule the async task (fire and forget) if event loop is available
-            bluetooth_command_sent = False
-            try:
-                loop = asyncio.get_event_loop()
-                loop.create_task(send_bluetooth_command())
-                bluetooth_command_sent = True
-            except RuntimeError:
+            # Hand the drive command to the car's BLE consumer without waiting for it
+            bluetooth_command_sent = queue_drive_command(car, car_manager, move, x, boost_bool)
+            if not bluetooth_command_sent:
                 # No event loop running, can't send BLE command
-                logger.warning(f"No event loop available to send Bluetooth command for car {car_id}")
+                logger.warning("No event loop available to send Bluetooth command for car %s", car_id)
             
+            if compact:
+                return _MOVE_ACKS[bluetooth_command_sent]
             return {
                 "status": "success",
                 "action": "move_car",
@@ -239,17 +466,16 @@ def handle_get_car_status(data, car_manager=None):
     """Handle get car status requests."""
     car_id = data.get("car")
     
-    print(f"Getting status for car {car_id}")
+    logger.debug("Getting status for car %s", car_id)
     
     # Get real car status if car manager is available
     if car_manager and car_id is not None:
         car = car_manager.get_car(car_id)
         if car:
-            return {
-                "status": "success",
-                "action": "get_car_status",
-                "car_status": car.get_status()
-            }            
+            # Splice the car's cached JSON status instead of re-encoding it
+            return '{"status": "success", "action": "get_car_status", "car_status": %s}' % (
+                car.get_status_json()
+            )
     
     # If car manager is not available, return an error response
     return {
@@ -260,247 +486,35 @@ def handle_get_car_status(data, car_manager=None):
 
 def handle_get_all_cars(data, car_manager=None):
     """Handle get all cars requests."""
-    print("Getting all cars status")
+    logger.debug("Getting all cars status")
     
     if car_manager:
-        cars = car_manager.get_all_cars()
-        cars_status = [car.get_status() for car in cars]
-        return {
-            "status": "success",
-            "cars": cars_status,
-            "count": len(cars_status)
-        }
-    
-    return {
-        "status": "error",
-        "message": "Car manager not available"
-    }
-
-def handle_connect_to_car(data, car_manager=None, websocket_id=None):
-    """Handle connect to car via Bluetooth requests."""
-    car_id = data.get("car")
-    ble_address = data.get("ble_address")
-    
-    print(f"Connecting to car {car_id} via Bluetooth")
-    
-    # Check car ownership if car_manager is available
-    if car_manager and car_id is not None:
-        car = car_manager.get_car(car_id)
-        if car and websocket_id and car.websocket_id is not None and car.websocket_id != websocket_id:
-            return {
-                "status": "error",
-                "action": "connect_to_car",
-                "message": f"Car {car_id} is controlled by another client. Select the car first."
-            }
-    
-    if not BLUETOOTH_AVAILABLE:
-        return {
-            "status": "error",
-            "message": "Bluetooth service not available"
-        }
-    
-    bluetooth_service = get_bluetooth_service()
-    if not bluetooth_service:
-        return {
-            "status": "error",
-            "message": "Bluetooth service not initialized"
-        }
-    
-    try:
-        # Find car by ID or BLE address
-        car = None
-        if car_manager and car_id is not None:
-            car = car_manager.get_car(car_id)
-        elif car_manager and ble_address:
-            car = car_manager.get_car_by_ble_address(ble_address)
-        
-        if not car:
-            return {
-                "status": "error",
-                "message": f"Car not found (ID: {car_id}, Address: {ble_address})"
-            }
-        
-        # Try to connect via BLE service
-        # Note: This would need to be made async in a real implementation
-        return {
-            "status": "success",
-            "message": f"Connection initiated to car {car.name} ({car.ble_address})",
-            "car": car.get_status()
-        }
-        
-    except Exception as e:
-        return {
-            "status": "error",
-            "message": f"Error connecting to car: {str(e)}"
-        }
-
-def handle_send_to_car(data, car_manager=None, websocket_id=None):
-    """Handle sending commands/data to car via Bluetooth."""
-    car_id = data.get("car")
-    command = data.get("command", "test")
-    message = data.get("message", "Hello from server!")
-    
-    print(f"Sending to car {car_id}: command={command}, message={message}")
-    
-    # Check car ownership if car_manager is available
-    if car_manager and car_id is not None:
-        car = car_manager.get_car(car_id)
-        if car and websocket_id and car.websocket_id is not None and car.websocket_id != websocket_id:
-            return {
-                "status": "error",
-                "action": "send_to_car",
-                "message": f"Car {car_id} is controlled by another client. Select the car first."
-            }
-    
-    if not BLUETOOTH_AVAILABLE:
-        return {
-            "status": "error",
-            "message": "Bluetooth service not available"
-        }
-    
-    bluetooth_service = get_bluetooth_service()
-    if not bluetooth_service:
-        return {
-            "status": "error",
-            "message": "Bluetooth service not initialized"
-        }
-    
-    try:
-        # Find the car
-        car = None
-        if car_manager and car_id is not None:
-            car = car_manager.get_car(car_id)
-        
-        if not car:
-            return {
-                "status": "error",
-                "message": f"Car {car_id} not found"
-            }
-        
-        if not car.ble_address:
-            return {
-                "status": "error",
-                "message": f"Car {car_id} has no BLE address"
-            }
-        
-        # Get the BLE device
-        ble_devices = bluetooth_service.ble_service.discovered_devices
-        ble_device = ble_devices.get(car.ble_address)
-        
-        if not ble_device:
-            return {
-                "status": "error",
-                "message": f"Car {car_id} BLE device not found. Try discovering cars first."
-            }
-        
-        # For now, we'll send a static test message
-        # This should be made async in a real implementation
-        test_message = {
-            "command": command,
-            "message": message,
-            "timestamp": str(car.last_seen),
-            "car_id": car_id
-        }
-        
-        print(f"Would send to {car.name} ({car.ble_address}): {test_message}")
-        
-        # Update car status to show communication attempt
-        if car_manager:
-            car_manager.update_car_status(car_id, connected=True)
-        
-        return {
-            "status": "success",
-            "message": f"Command sent to car {car.name}",
-            "sent_data": test_message,
-            "car": car.get_status()
-        }
-        
-    except Exception as e:
-        print(f"Error in handle_send_to_car: {e}")
-        return {
-            "status": "error",
-            "message": f"Error sending to car: {str(e)}"
-        }
-
-def handle_switch_to_scan_phase(data, car_manager=None):
-    """Handle switch to scan phase requests."""
-    print("Switching to scan phase")
-    
-    if not BLUETOOTH_AVAILABLE:
-        return {
-            "status": "error",
-            "message": "Bluetooth service not available"
-        }
-    
-    bluetooth_service = get_bluetooth_service()
-    if not bluetooth_service:
-        return {
-            "status": "error",
-            "message": "Bluetooth service not initialized"
-        }
+        # Splice the manager's cached JSON snapshot instead of re-encoding every
+        # car, and reuse the whole response while that snapshot is unchanged
+        global _all_cars_response
+        snapshot = car_manager.snapshot_json()
+        cached_snapshot, response = _all_cars_response
+        if snapshot is not cached_snapshot:
+            response = '{"status": "success", "cars": %s, "count": %d}' % (
+                snapshot,
+                car_manager.get_car_count()
+            )
+            _all_cars_response = (snapshot, response)
+        return response
     
-    try:
-        # This will be called async in the WebSocket handler
-        return {
-            "status": "pending",
-            "action": "switch_to_scan_phase",
-            "message": "Switching to scan phase..."
-        }
-    except Exception as e:
-        return {
-            "status": "error",
-            "message": f"Error switching to scan phase: {str(e)}"
-        }
-
-def handle_switch_to_control_phase(data, car_manager=None):
-    """Handle switch to control phase requests."""
-    print("Switching to control phase")
-    
-    if not BLUETOOTH_AVAILABLE:
-        return {
-            "status": "error",
-            "message": "Bluetooth service not available"
-        }
-    
-    bluetooth_service = get_bluetooth_service()
-    if not bluetooth_service:
-        return {
-            "status": "error",
-            "message": "Bluetooth service not initialized"
-        }
-    
-    try:
-        # This will be called async in the WebSocket handler
-        return {
-            "status": "pending",
-            "action": "switch_to_control_phase",
-            "message": "Switching to control phase..."
-        }
-    except Exception as e:
-        return {
-            "status": "error",
-            "message": f"Error switching to control phase: {str(e)}"
-        }
+    return _ERR_NO_CAR_MANAGER
 
 def handle_get_phase_status(data, car_manager=None):
     """Handle get phase status requests."""
-    print("Getting phase status")
-    
-    if not BLUETOOTH_AVAILABLE:
-        return {
-            "status": "error",
-            "message": "Bluetooth service not available"
-        }
+    logger.debug("Getting phase status")
     
-    bluetooth_service = get_bluetooth_service()
-    if not bluetooth_service:
-        return {
-            "status": "error",
-            "message": "Bluetooth service not initialized"
-        }
+    # The cached service is the common case; work out why it is missing only on failure
+    ble_service = _ble()
+    if ble_service is None:
+        return _ERR_BT_NOT_INITIALIZED if BLUETOOTH_AVAILABLE else _ERR_BT_NOT_AVAILABLE
     
     try:
-        ble_status = bluetooth_service.ble_service.get_status()
+        ble_status = ble_service.get_status()
         return {
             "status": "success",
             "phase_status": ble_status
@@ -525,20 +539,13 @@ def handle_unknown_action(data):
     return response
 
 def handle_invalid_json():
-    """Handle invalid JSON requests."""
-    return {
-        "status": "error",
-        "message": "Invalid JSON format"
-    }
+    """Handle invalid JSON requests; the response is already JSON encoded."""
+    return _ERR_INVALID_JSON
 
 def handle_get_free_cars(data, car_manager=None):
     """Handle get free cars requests."""
     if not car_manager:
-        return {
-            "status": "error",
-            "action": "get_free_cars",
-            "message": "Car manager not available"
-        }
+        return _ERR_GET_FREE_CARS_NO_MANAGER
     
     free_cars = car_manager.get_free_cars()
     free_car_ids = [car.car_id for car in free_cars]
@@ -555,36 +562,24 @@ def handle_select_car(data, car_manager=None, websocket_id=None):
     car_id = data.get("car")
     
     if car_id is None:
-        return {
-            "status": "error",
-            "action": "select_car",
-            "message": "Car ID is required"
-        }
+        return _ERR_SELECT_NO_CAR_ID
     
     if not car_manager:
-        return {
-            "status": "error",
-            "action": "select_car",
-            "message": "Car manager not available"
-        }
+        return _ERR_SELECT_NO_MANAGER
     
     if not websocket_id:
-        return {
-            "status": "error",
-            "action": "select_car",
-            "message": "WebSocket ID not available"
-        }
+        return _ERR_SELECT_NO_WEBSOCKET
     
-    success, message, car = car_manager.select_car(car_id, websocket_id)
+    result = car_manager.select_car(car_id, websocket_id)
     
     response = {
-        "status": "success" if success else "error",
+        "status": "success" if result.ok else "error",
         "action": "select_car",
-        "message": message
+        "message": result.message
     }
     
-    if success and car:
-        response["car"] = car.get_status()
+    if result.ok and result.car:
+        response["car"] = result.car.get_status()
     
     return response
 
@@ -593,25 +588,19 @@ def handle_free_car(data, car_manager=None, websocket_id=None):
     car_id = data.get("car")
     
     if car_id is None:
-        return {
-            "status": "error",
-            "action": "free_car",
-            "message": "Car ID is required"
-        }
+        return _ERR_FREE_NO_CAR_ID
     
     if not car_manager:
-        return {
-            "status": "error",
-            "action": "free_car", 
-            "message": "Car manager not available"
-        }
+        return _ERR_FREE_NO_MANAGER
     
-    success, message = car_manager.free_car(car_id, websocket_id)
+    result = car_manager.free_car(car_id, websocket_id)
+    if result.ok:
+        cancel_drive_consumer(car_id)
     
     return {
-        "status": "success" if success else "error",
+        "status": "success" if result.ok else "error",
         "action": "free_car",
-        "message": message,
+        "message": result.message,
         "car": car_id
     }
 
@@ -624,10 +613,6 @@ ACTION_HANDLERS = {
     "get_free_cars": handle_get_free_cars,
     "select_car": handle_select_car,
     "free_car": handle_free_car,
-    "send_to_car": handle_send_to_car,
-    "connect_to_car": handle_connect_to_car,
-    "switch_to_scan_phase": handle_switch_to_scan_phase,
-    "switch_to_control_phase": handle_switch_to_control_phase,
     "get_phase_status": handle_get_phase_status,
 }
 
@@ -6,6 +6,7 @@ import uuid
 import logging
 from .handlers import *
 from .async_handlers import ASYNC_HANDLERS
+from encoding import dumps, loads
 
 # Global car manager for WebSocket handler access
 car_manager = None
@@ -15,6 +16,16 @@ active_connections = {}
 
 logger = logging.getLogger(__name__)
 
+# Synchronous actions whose handlers take the connection's websocket_id
+_WEBSOCKET_ID_ACTIONS = frozenset({"select_car", "free_car", "move_car"})
+
+# Fixed error replies, encoded once at import
+_INVALID_JSON_RESPONSE = handle_invalid_json()
+_INTERNAL_ERROR_RESPONSE = dumps({
+    "status": "error",
+    "message": "Internal server error"
+})
+
 def set_car_manager(manager):
     """
     Configure the global car manager for WebSocket handler access.
@@ -25,6 +36,23 @@ def set_car_manager(manager):
     global car_manager
     car_manager = manager
 
+def encode_response(response):
+    """
+    Encode a handler response for transmission.
+    
+    Handlers may return an already encoded JSON string (e.g. a cached snapshot)
+    which is sent as-is instead of being encoded a second time.
+    
+    Args:
+        response (dict or str): Handler response
+        
+    Returns:
+        str: JSON text to send to the client
+    """
+    if isinstance(response, str):
+        return response
+    return dumps(response)
+
 def get_car_manager():
     """
     Retrieve the global car manager instance.
@@ -53,49 +81,58 @@ async def handle_message(websocket, path=None):
     websocket_id = str(uuid.uuid4())
     active_connections[websocket_id] = websocket
     
-    logger.info(f"New WebSocket connection established: {websocket_id}")
+    logger.info("New WebSocket connection established: %s", websocket_id)
+    
+    # Bind the dispatch lookups once per connection rather than per message
+    get_async_handler = ASYNC_HANDLERS.get
+    get_handler = ACTION_HANDLERS.get
+    websocket_id_actions = _WEBSOCKET_ID_ACTIONS
     
     try:
         async for message in websocket:
             try:
-                data = json.loads(message)
-                print(f"Reçu: {data}")
+                # Binary frames carry packed move commands and skip JSON entirely
+                if type(message) is bytes:
+                    await websocket.send(encode_response(
+                        handle_move_car_binary(message, car_manager, websocket_id)
+                    ))
+                    continue
+                
+                data = loads(message)
+                logger.debug("Received from %s: %s", websocket_id, data)
                 
                 action = data.get("action")
                 
                 # Route to async handlers first (for operations requiring await)
-                if action in ASYNC_HANDLERS:
-                    response = await ASYNC_HANDLERS[action](data, car_manager)
-                # Route to synchronous handlers for immediate operations
-                elif action in ACTION_HANDLERS:
-                    # Pass websocket_id for car assignment and ownership tracking
-                    if action in ["select_car", "free_car", "move_car", "send_to_car", "connect_to_car"]:
-                        response = ACTION_HANDLERS[action](data, car_manager, websocket_id)
-                    else:
-                        response = ACTION_HANDLERS[action](data, car_manager)
+                async_handler = get_async_handler(action)
+                if async_handler is not None:
+                    response = await async_handler(data, car_manager)
                 else:
-                    response = handle_unknown_action(data)
+                    # Route to synchronous handlers for immediate operations
+                    handler = get_handler(action)
+                    if handler is None:
+                        response = handle_unknown_action(data)
+                    elif action in websocket_id_actions:
+                        # Pass websocket_id for car assignment and ownership tracking
+                        response = handler(data, car_manager, websocket_id)
+                    else:
+                        response = handler(data, car_manager)
                     
-                await websocket.send(json.dumps(response))
+                await websocket.send(encode_response(response))
                 
             except json.JSONDecodeError:
-                error_response = handle_invalid_json()
-                await websocket.send(json.dumps(error_response))
+                await websocket.send(_INVALID_JSON_RESPONSE)
             except websockets.exceptions.ConnectionClosed:
-                print(f"Client {websocket_id} disconnected")
+                logger.info("Client %s disconnected", websocket_id)
                 break
             except Exception as e:
-                print(f"Error handling message from {websocket_id}: {e}")
-                error_response = {
-                    "status": "error",
-                    "message": "Internal server error"
-                }
+                logger.error("Error handling message from %s: %s", websocket_id, e)
                 try:
-                    await websocket.send(json.dumps(error_response))
+                    await websocket.send(_INTERNAL_ERROR_RESPONSE)
                 except:
                     pass
     except websockets.exceptions.ConnectionClosed:
-        print(f"Client {websocket_id} disconnected during message handling")
+        logger.info("Client %s disconnected during message handling", websocket_id)
     finally:
         # Cleanup: free all cars assigned to this websocket
         await cleanup_websocket_connection(websocket_id)
@@ -107,11 +144,12 @@ async def cleanup_websocket_connection(websocket_id):
     
     if car_manager:
         freed_cars = car_manager.free_cars_by_websocket(websocket_id)
+        for car_id in freed_cars:
+            cancel_drive_consumer(car_id)
         if freed_cars:
-            logger.info(f"Freed cars {freed_cars} from disconnected websocket {websocket_id}")
-            print(f"Freed cars {freed_cars} from disconnected websocket {websocket_id}")
+            logger.info("Freed cars %s from disconnected websocket %s", freed_cars, websocket_id)
     
-    logger.info(f"WebSocket connection {websocket_id} cleaned up")
+    logger.info("WebSocket connection %s cleaned up", websocket_id)
 
 async def start_server_async(port=8000):
     print(f"Serveur WebSocket en écoute sur le port {port}...")